@@ -0,0 +1,137 @@
+"""
+Custo de partida do painel: importações do script e tempo de rerun por seção.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeticoes 10 --secoes "Início,Comparador"
+    python benchmarks/bench_startup.py --app /outro/checkout/streamlit_app.py   # comparar versões
+
+- partida a frio: processo novo que executa o script em modo "bare" (sem servidor, na
+  página padrão); mede o tempo de parede do processo e do script e quais
+  módulos pesados (pandas, NumPy, pyarrow, Altair, openpyxl) acabaram importados;
+- reruns: um processo novo por seção com `streamlit.testing.v1.AppTest`; o primeiro
+  run (importações + caches) sai à parte e os N seguintes dão mediana e melhor tempo.
+
+Grava JSON em benchmarks/results/startup-<commit>.json.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(RAIZ, "benchmarks", "results")
+# título da seção -> arquivo da página (versões antigas do app usavam um radio "Seções" com os títulos)
+SECOES = {
+    "Início": "painel/inicio.py",
+    "Panorama IDEB": "painel/panorama.py",
+    "Ranking de Municípios": "painel/ranking.py",
+    "Evolução Temporal": "painel/evolucao.py",
+    "Comparador": "painel/comparador.py",
+    "Anomalias": "painel/anomalias.py",
+    "Mapa": "painel/mapa.py",
+    "Metodologia & Fontes": "painel/metodologia.py",
+}
+MODULOS_PESADOS = ["pandas", "numpy", "pyarrow", "altair", "openpyxl"]
+
+# executado com cwd = pasta do app (as bases são procuradas em ".")
+_FRIO = r"""
+import json, runpy, sys, time
+t0 = time.perf_counter()
+runpy.run_path(sys.argv[1], run_name="__main__")
+print(json.dumps({"script_s": time.perf_counter() - t0,
+                  "modulos": [m for m in sys.argv[2].split(",") if m in sys.modules]}))
+"""
+
+_RERUN = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+PAGINA_INICIAL = "painel/inicio.py"
+app, secao, pagina, n = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4])
+t0 = time.perf_counter()
+at = AppTest.from_file(app, default_timeout=300).run()
+radio = [r for r in at.sidebar.radio if r.label == "Seções"]
+if radio:
+    if radio[0].value != secao:
+        radio[0].set_value(secao).run()
+elif pagina != PAGINA_INICIAL:
+    at.switch_page(pagina).run()
+primeiro = time.perf_counter() - t0
+tempos = []
+for _ in range(n):
+    t0 = time.perf_counter()
+    at.run()
+    tempos.append(time.perf_counter() - t0)
+print(json.dumps({"primeiro_s": primeiro, "tempos": tempos,
+                  "erros": [str(e.value) for e in at.exception]}))
+"""
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, cwd=RAIZ,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "sem-git"
+
+def _filho(codigo: str, app: str, *args: str) -> dict:
+    """Roda `codigo` num interpretador novo (cwd = pasta do app) e lê a última linha JSON do stdout."""
+    proc = subprocess.run([sys.executable, "-c", codigo, app, *args], cwd=os.path.dirname(app),
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def partida_a_frio(app: str, repeticoes: int) -> dict:
+    processo, script, modulos = [], [], []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        r = _filho(_FRIO, app, ",".join(MODULOS_PESADOS))
+        processo.append(time.perf_counter() - t0)
+        script.append(r["script_s"])
+        modulos = r["modulos"]
+    return {"processo_mediana_s": statistics.median(processo), "processo_min_s": min(processo),
+            "script_mediana_s": statistics.median(script), "script_min_s": min(script),
+            "modulos_pesados": modulos}
+
+def reruns(app: str, secoes: list[str], repeticoes: int) -> dict:
+    out = {}
+    for secao in secoes:
+        r = _filho(_RERUN, app, secao, SECOES[secao], str(repeticoes))
+        out[secao] = {"primeiro_s": r["primeiro_s"], "rerun_mediana_s": statistics.median(r["tempos"]),
+                      "rerun_min_s": min(r["tempos"]), "erros": r["erros"]}
+        print(f"{secao:24s} primeiro {r['primeiro_s'] * 1000:9.1f} ms   rerun "
+              f"{out[secao]['rerun_mediana_s'] * 1000:8.1f} ms (mín {out[secao]['rerun_min_s'] * 1000:.1f})"
+              + (f"   ERROS: {r['erros']}" if r["erros"] else ""), flush=True)
+    return out
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default=os.path.join(RAIZ, "streamlit_app.py"))
+    parser.add_argument("--secoes", default=",".join(SECOES), help="seções do menu, separadas por vírgula")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--saida", help="arquivo JSON (padrão: benchmarks/results/startup-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    app = os.path.abspath(args.app)
+    frio = partida_a_frio(app, args.repeticoes)
+    print(f"{'partida a frio':24s} processo {frio['processo_mediana_s'] * 1000:9.1f} ms   script "
+          f"{frio['script_mediana_s'] * 1000:8.1f} ms   pesados: {', '.join(frio['modulos_pesados']) or '-'}",
+          flush=True)
+    resultado = {
+        "commit": _commit(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "app": app,
+        "partida_a_frio": frio,
+        "secoes": reruns(app, [s.strip() for s in args.secoes.split(",") if s.strip()], args.repeticoes),
+    }
+    saida = args.saida or os.path.join(RESULTS_DIR, f"startup-{resultado['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"resultados: {saida}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
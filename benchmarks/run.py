@@ -0,0 +1,179 @@
+"""
+Benchmarks dos caminhos quentes de ingestão, reshape e ranking.
+
+    python benchmarks/run.py                       # cenários pequeno e medio
+    python benchmarks/run.py --cenarios grande --repeticoes 3
+    python benchmarks/run.py --comparar benchmarks/results/<commit>.json
+
+Mede tempo de parede (mediana e melhor de N execuções) e pico de memória
+(tracemalloc, numa execução separada) e grava JSON em benchmarks/results/,
+nomeado pelo commit atual, para comparar entre versões. Com --comparar, sai
+com código 1 se algum caso ficar mais lento que --tolerancia.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import CENARIOS, make_ideb_frame  # noqa: E402
+from ideb import (  # noqa: E402
+    build_anomalies,
+    build_cube,
+    build_long_table,
+    build_municipio_index,
+    build_ranking_index,
+    build_schema_index,
+    coerce_numeric_cols,
+    family_timeseries,
+    ffill_text_cols,
+    get_muni_label_col,
+    cube_matrix,
+    municipio_mask,
+    pairwise_stats,
+    prepare_dataset,
+    rank_municipios,
+    read_xlsx,
+)
+from ideb.cleaning import _coerce_block  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+# escrever xlsx grande com openpyxl leva minutos: acima disso o caso de leitura é pulado
+XLSX_MAX_CELULAS = 100_000
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "sem-git"
+
+def medir(fn, repeticoes: int) -> dict:
+    """Tempo (s) de `fn()` em `repeticoes` execuções + pico de memória (bytes) numa execução extra."""
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        fn()
+        tempos.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"mediana_s": statistics.median(tempos), "min_s": min(tempos), "pico_bytes": pico}
+
+def casos(raw: pd.DataFrame, xlsx: str | None) -> dict:
+    """Casos medidos, na ordem do pipeline do app."""
+    raw = raw.copy()
+    raw.columns = [str(c).strip() for c in raw.columns]
+    tipada = coerce_numeric_cols(raw)
+    preparada = prepare_dataset(raw)
+    _, label_col = get_muni_label_col(preparada)
+    schema = build_schema_index(preparada.columns)
+    long_df = build_long_table(preparada, schema, label_col)
+    familia = sorted(schema["familias"])[0]
+    municipios = build_municipio_index(preparada)["opcoes"][:5]
+    cols_ano = list(preparada.columns[schema["familias"][familia][max(schema["familias"][familia])]])
+    texto = raw[cols_ano]
+    ranking = build_ranking_index(preparada, label_col)
+    midx = build_municipio_index(preparada)
+    metrica = next(iter(ranking["ordens"]))
+    cube = build_cube(long_df)
+    wide = cube_matrix(cube)
+
+    c = {
+        "coerce_numeric_cols": lambda: coerce_numeric_cols(raw),
+        "ffill_text_cols": lambda: ffill_text_cols(tipada),
+        "_coerce_block": lambda: _coerce_block(texto, cols_ano),
+        "prepare_dataset": lambda: prepare_dataset(raw),
+        "evolucao_tabela_longa": lambda: build_long_table(preparada, schema, label_col),
+        "evolucao_serie": lambda: family_timeseries(long_df, familia, municipios),
+        "ranking_indice": lambda: build_ranking_index(preparada, label_col),
+        "ranking_consulta": lambda: rank_municipios(
+            ranking, metrica, mask=municipio_mask(midx, "sao"), topn=20),
+        "correlacoes_pares": lambda: pairwise_stats(wide),
+        "anomalias_relatorio": lambda: build_anomalies(cube),
+    }
+    if xlsx:
+        # nome mantido para comparar com resultados antigos (era o cache do app em volta de `read_xlsx`)
+        c = {"load_xlsx_local": lambda: read_xlsx(xlsx), **c}
+    return c
+
+def rodar(cenarios: list[str], repeticoes: int, xlsx_max_celulas: int = XLSX_MAX_CELULAS) -> dict:
+    resultado = {
+        "commit": _commit(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "cenarios": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome in cenarios:
+            params = CENARIOS[nome]
+            raw = make_ideb_frame(**params)
+            xlsx = None
+            if raw.size <= xlsx_max_celulas:
+                xlsx = os.path.join(tmp, f"{nome}.xlsx")
+                raw.to_excel(xlsx, index=False)
+            medidas = {}
+            for caso, fn in casos(raw, xlsx).items():
+                medidas[caso] = medir(fn, repeticoes)
+                print(f"{nome:8s} {caso:24s} {medidas[caso]['mediana_s'] * 1000:10.2f} ms "
+                      f"{medidas[caso]['pico_bytes'] / 2**20:9.2f} MB", flush=True)
+            resultado["cenarios"][nome] = {"linhas": raw.shape[0], "colunas": raw.shape[1], "casos": medidas}
+    return resultado
+
+def comparar(atual: dict, anterior: dict, tolerancia: float) -> list[str]:
+    """Casos em que o melhor tempo piorou mais que `tolerancia` (ex.: 0.2 = 20%); o mínimo oscila menos que a mediana."""
+    regressoes = []
+    for cen, dados in atual["cenarios"].items():
+        base = anterior.get("cenarios", {}).get(cen, {}).get("casos", {})
+        for caso, m in dados["casos"].items():
+            if caso not in base:
+                continue
+            razao = m["min_s"] / max(base[caso]["min_s"], 1e-9)
+            marca = "  <-- REGRESSÃO" if razao > 1 + tolerancia else ""
+            print(f"{cen:8s} {caso:24s} x{razao:5.2f}{marca}")
+            if marca:
+                regressoes.append(f"{cen}/{caso}")
+    return regressoes
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cenarios", default="pequeno,medio", help=f"entre {', '.join(CENARIOS)}")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--saida", help="arquivo JSON (padrão: benchmarks/results/<commit>.json)")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.20)
+    parser.add_argument("--xlsx-max-celulas", type=int, default=XLSX_MAX_CELULAS,
+                        help="mede a leitura do xlsx só em cenários até este tamanho")
+    args = parser.parse_args(argv)
+
+    cenarios = [c.strip() for c in args.cenarios.split(",") if c.strip()]
+    resultado = rodar(cenarios, args.repeticoes, args.xlsx_max_celulas)
+    saida = args.saida or os.path.join(RESULTS_DIR, f"{resultado['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"resultados: {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            regressoes = comparar(resultado, json.load(f), args.tolerancia)
+        if regressoes:
+            print(f"{len(regressoes)} regressão(ões): {', '.join(regressoes)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
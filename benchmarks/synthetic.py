@@ -0,0 +1,62 @@
+"""
+Gerador de planilhas sintéticas no layout da planilha IDEB por município.
+
+Escala o layout real em municípios x famílias x anos x subperíodos, incluindo o
+que torna a ingestão cara: vírgula decimal, '-'/'ND' como nulos, nomes de coluna
+duplicados e linhas agrupadas (NO_MUNICIPIO/REDE em branco abaixo da 1ª linha).
+"""
+import numpy as np
+import pandas as pd
+
+_NOMES = ["São", "Vitória", "Água", "Conceição", "Itapemirim", "Castelo", "Jerônimo",
+          "Alegre", "Guaçuí", "Muniz", "Santa", "Ibiraçu", "Pancas", "Iúna", "Viana"]
+_REDES = ["Estadual", "Municipal", "Pública"]
+
+def make_ideb_frame(n_municipios: int = 78, n_familias: int = 6, anos=(2017, 2019, 2021, 2023),
+                    n_subperiodos: int = 4, redes_por_municipio: int = 2, frac_nulos: float = 0.05,
+                    frac_virgula: float = 0.5, n_duplicadas: int = 2, seed: int = 0) -> pd.DataFrame:
+    """
+    Monta o DataFrame "cru" (como sai do `read_excel`):
+    - famílias `VL_FAMkk_<ano>_<sub>` (subperíodos 1..n) e `VL_FAMkk_<ano>` (anual) alternadas;
+    - valores como texto, parte com vírgula decimal e parte nula ('-', 'ND');
+    - `n_duplicadas` colunas repetidas com o mesmo nome;
+    - `redes_por_municipio` linhas por município, com nome/rede só na primeira (ffill).
+    """
+    rng = np.random.default_rng(seed)
+    n_linhas = n_municipios * redes_por_municipio
+
+    codigos = 3200000 + np.arange(n_municipios) * 7
+    nomes = [f"{_NOMES[i % len(_NOMES)]} {i:04d}" for i in range(n_municipios)]
+    cols = {
+        "SG_UF": np.repeat("ES", n_linhas).astype(object),
+        "CO_MUNICIPIO": np.repeat(codigos, redes_por_municipio),
+        "NO_MUNICIPIO": np.array([n if r == 0 else None for n in nomes for r in range(redes_por_municipio)], dtype=object),
+        "REDE": np.array([_REDES[r % len(_REDES)] for _ in nomes for r in range(redes_por_municipio)], dtype=object),
+    }
+    nomes_metricas = []
+    for f in range(n_familias):
+        sufixos = [f"_{s}" for s in range(1, n_subperiodos + 1)] if f % 2 == 0 else [""]
+        for ano in anos:
+            nomes_metricas += [f"VL_FAM{f:02d}_{ano}{s}" for s in sufixos]
+
+    valores = rng.uniform(0, 100, size=(n_linhas, len(nomes_metricas))).round(2)
+    texto = valores.astype(str).astype(object)
+    virgula = rng.random(texto.shape) < frac_virgula
+    if virgula.any():  # np.char.replace falha numa seleção vazia (frac_virgula=0)
+        texto[virgula] = np.char.replace(texto[virgula].astype(str), ".", ",")
+    nulos = rng.random(texto.shape) < frac_nulos
+    texto[nulos] = np.where(rng.random(nulos.sum()) < 0.5, "-", "ND")
+
+    frame = pd.DataFrame(cols)
+    metricas = pd.DataFrame(texto, columns=nomes_metricas)
+    extras = metricas.iloc[:, :n_duplicadas].copy()  # mesmos nomes: colunas duplicadas
+    return pd.concat([frame, metricas, extras], axis=1)
+
+CENARIOS = {
+    # próximo da planilha real (ES, ensino médio)
+    "pequeno": dict(n_municipios=78, n_familias=6, n_subperiodos=4),
+    # um estado grande, várias edições
+    "medio": dict(n_municipios=853, n_familias=10, anos=tuple(range(2005, 2025, 2)), n_subperiodos=4),
+    # Brasil inteiro, muitas colunas com ano
+    "grande": dict(n_municipios=5570, n_familias=20, anos=tuple(range(2005, 2025, 2)), n_subperiodos=4),
+}
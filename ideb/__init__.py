@@ -0,0 +1,107 @@
+"""
+Núcleo de dados do Painel IDEB, sem dependência do Streamlit.
+
+Uso em scripts/lotes:
+
+    from ideb import open_dataset, rank_municipios, family_timeseries, compare_bar
+    base = open_dataset("IDEB_ensino_medio_municipios_2023_ES.xlsx")
+    rank_municipios(base["ranking"], "VL_OBSERVADO_2023", topn=10)
+
+Os nomes abaixo são carregados sob demanda (PEP 562): `import ideb` não importa
+pandas/NumPy; o submódulo só é importado no primeiro acesso ao nome.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .anomalies import build_anomalies, filter_anomalies
+    from .catalog import list_sheets, scan_catalog, scan_censo
+    from .censo import build_censo_cube, join_censo, load_censo, prepare_censo
+    from .cleaning import (
+        coerce_numeric_cols,
+        detect_muni_col,
+        ffill_text_cols,
+        get_muni_label_col,
+        infer_numeric_types,
+        normalize_rede,
+    )
+    from .compare import compare_bar, compare_scatter
+    from .dataset import derive_tables, open_dataset
+    from .escolas import aggregate_school_chunks, read_school_aggregate
+    from .export import round_floats, safe_filename, to_csv_bytes, to_parquet_bytes
+    from .geo import map_values, simplified_topology
+    from .loading import file_version, load_prepared, load_workbook_sheets, prepare_dataset, read_xlsx
+    from .municipios import build_municipio_index, municipio_mask, normalize_text, search_municipios
+    from .ranking import build_ranking_index, rank_municipios
+    from .reshape import build_cube, build_long_table, cube_lookup, family_timeseries
+    from .schema import build_schema_index, family_positions, parse_metric_col
+    from .stats import correlation_matrix, cube_matrix, ols_fit, pairwise_stats
+    from .trajectory import build_trajectory, trajectory_kind
+
+# nome público -> submódulo que o define
+_EXPORTS = {
+    "aggregate_school_chunks": "escolas",
+    "build_anomalies": "anomalies",
+    "build_censo_cube": "censo",
+    "build_cube": "reshape",
+    "build_long_table": "reshape",
+    "build_municipio_index": "municipios",
+    "build_ranking_index": "ranking",
+    "build_schema_index": "schema",
+    "build_trajectory": "trajectory",
+    "coerce_numeric_cols": "cleaning",
+    "compare_bar": "compare",
+    "compare_scatter": "compare",
+    "correlation_matrix": "stats",
+    "cube_lookup": "reshape",
+    "cube_matrix": "stats",
+    "derive_tables": "dataset",
+    "detect_muni_col": "cleaning",
+    "family_positions": "schema",
+    "family_timeseries": "reshape",
+    "ffill_text_cols": "cleaning",
+    "file_version": "loading",
+    "filter_anomalies": "anomalies",
+    "get_muni_label_col": "cleaning",
+    "infer_numeric_types": "cleaning",
+    "join_censo": "censo",
+    "list_sheets": "catalog",
+    "load_censo": "censo",
+    "load_prepared": "loading",
+    "load_workbook_sheets": "loading",
+    "map_values": "geo",
+    "municipio_mask": "municipios",
+    "normalize_rede": "cleaning",
+    "normalize_text": "municipios",
+    "ols_fit": "stats",
+    "open_dataset": "dataset",
+    "pairwise_stats": "stats",
+    "parse_metric_col": "schema",
+    "prepare_censo": "censo",
+    "prepare_dataset": "loading",
+    "rank_municipios": "ranking",
+    "read_school_aggregate": "escolas",
+    "read_xlsx": "loading",
+    "round_floats": "export",
+    "safe_filename": "export",
+    "scan_catalog": "catalog",
+    "scan_censo": "catalog",
+    "search_municipios": "municipios",
+    "simplified_topology": "geo",
+    "to_csv_bytes": "export",
+    "to_parquet_bytes": "export",
+    "trajectory_kind": "trajectory",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(nome: str):
+    modulo = _EXPORTS.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f".{modulo}", __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
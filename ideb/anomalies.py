@@ -0,0 +1,121 @@
+"""
+Valores suspeitos antes da publicação: uma passada vetorizada sobre o cubo agregado
+(família x ano x município) de todas as famílias de uma vez.
+
+- "z robusto": |0,6745·(x − mediana)/MAD| acima do limite, dentro do mesmo (família, ano);
+- "IQR": fora das cercas de Tukey [Q1 − k·IQR, Q3 + k·IQR] do mesmo (família, ano);
+- "salto": variação em relação à edição anterior do próprio município com z robusto
+  acima do limite entre as variações de todos os municípios na mesma transição
+  (mesmos ano anterior e ano: quem pulou uma edição não se mistura às consecutivas).
+
+Estatísticas de grupo saem de `groupby().transform` (sem laço por família); grupos
+com menos de `min_n` municípios ou sem dispersão não geram escore.
+"""
+import numpy as np
+import pandas as pd
+
+# critério -> descrição (usado nos filtros e na legenda do painel)
+ANOMALY_KINDS = {
+    "z robusto": "distante da mediana do estado (z robusto pela MAD)",
+    "IQR": "fora das cercas de Tukey (Q1 − k·IQR, Q3 + k·IQR)",
+    "salto": "queda/alta atípica em relação à edição anterior",
+}
+Z_LIMITE = 3.5  # Iglewicz & Hoaglin
+IQR_K = 1.5
+MIN_N = 5
+# Φ⁻¹(3/4) e √(π/2): tornam MAD e desvio médio absoluto comparáveis ao desvio-padrão numa normal
+_MAD_NORMAL, _MEANAD_NORMAL = 0.6745, 1.2533
+# bases reduzidas a float32: diferenças abaixo disso (relativas ao maior |x|) são ruído de arredondamento
+_RUIDO = 1e-6
+
+REPORT_COLS = ["família", "ano", "Município", "valor", "mediana", "z robusto", "Q1", "Q3",
+               "ano anterior", "salto", "z salto", "critérios", "gravidade"]
+
+def robust_z(valores: pd.Series, grupos: list, min_n: int = MIN_N) -> pd.Series:
+    """
+    z robusto de cada valor dentro do seu grupo: (x − mediana) / (MAD/0,6745).
+    - MAD nula (mais da metade dos valores iguais): usa o desvio médio absoluto x 1,2533;
+    - dispersão abaixo do ruído de float32 (relativo ao maior |x| do grupo) ou grupo com
+      menos de `min_n` valores: NaN.
+    """
+    g = valores.groupby(grupos, sort=False)
+    mediana = g.transform("median")
+    desvio = (valores - mediana).abs()
+    gd = desvio.groupby(grupos, sort=False)
+    ruido = _RUIDO * valores.abs().groupby(grupos, sort=False).transform("max")
+    mad, media_abs = gd.transform("median"), gd.transform("mean")
+    escala = (mad / _MAD_NORMAL).where(mad > ruido, _MEANAD_NORMAL * media_abs)
+    z = (valores - mediana) / escala.where(escala > ruido)
+    return z.where(g.transform("count") >= min_n)
+
+def build_anomalies(cube: pd.DataFrame, z_limite: float = Z_LIMITE, iqr_k: float = IQR_K,
+                    min_n: int = MIN_N) -> pd.DataFrame:
+    """
+    Relatório de anomalias do cubo (ver `reshape.build_cube`), uma linha por
+    (família, ano, município) sinalizado, colunas `REPORT_COLS`:
+    - "critérios": os critérios de `ANOMALY_KINDS` atendidos, separados por vírgula;
+    - "gravidade": maior |z| entre o valor e o salto, para ordenar o relatório;
+    - "salto"/"z salto" ficam NaN na primeira edição do município e quando menos de `min_n`
+      municípios fazem a mesma transição (ano anterior -> ano).
+    """
+    if cube.empty:
+        return pd.DataFrame(columns=REPORT_COLS)
+    tab = cube["valor"].astype("float64").reset_index()
+    grupo = [tab["família"], tab["ano"]]
+
+    # distribuição do estado em cada (família, ano)
+    tab["mediana"] = tab.groupby(grupo, sort=False)["valor"].transform("median")
+    tab["z robusto"] = robust_z(tab["valor"], grupo, min_n)
+    g = tab.groupby(grupo, sort=False)["valor"]
+    tab["Q1"], tab["Q3"] = g.transform("quantile", 0.25), g.transform("quantile", 0.75)
+    iqr = tab["Q3"] - tab["Q1"]
+    iqr = iqr.where(iqr > _RUIDO * tab["valor"].abs().groupby(grupo, sort=False).transform("max"))
+    grande = g.transform("count") >= min_n
+    fora_iqr = grande & ((tab["valor"] < tab["Q1"] - iqr_k * iqr) | (tab["valor"] > tab["Q3"] + iqr_k * iqr))
+
+    # edição anterior do mesmo município (cubo ordenado por família, ano, município)
+    tab = tab.sort_values(["família", "Município", "ano"], kind="mergesort")
+    serie = tab.groupby(["família", "Município"], sort=False)
+    tab["ano anterior"] = serie["ano"].shift()
+    tab["salto"] = tab["valor"] - serie["valor"].shift()
+    tab["z salto"] = robust_z(tab["salto"], [tab["família"], tab["ano anterior"], tab["ano"]], min_n)
+    tab = tab.sort_index()
+
+    criterios = pd.DataFrame({
+        "z robusto": tab["z robusto"].abs() > z_limite,
+        "IQR": fora_iqr,
+        "salto": tab["z salto"].abs() > z_limite,
+    })
+    marcas = criterios.to_numpy()
+    sinalizado = marcas.any(axis=1)
+    nomes = np.array(list(criterios.columns), dtype=object)
+    tab = tab[sinalizado].copy()
+    tab["critérios"] = [", ".join(nomes[linha]) for linha in marcas[sinalizado]]
+    tab["gravidade"] = np.fmax(tab["z robusto"].abs(), tab["z salto"].abs())
+    tab["ano anterior"] = tab["ano anterior"].astype("Int64")
+    return (
+        tab[REPORT_COLS]
+        .sort_values(["gravidade", "família", "ano", "Município"], ascending=[False, True, True, True],
+                     kind="mergesort", na_position="last")
+        .reset_index(drop=True)
+    )
+
+def filter_anomalies(report: pd.DataFrame, familias=None, criterios=None, min_gravidade: float = 0.0,
+                     quedas: bool = False) -> pd.DataFrame:
+    """
+    Fatia do relatório para a tela/exportação:
+    - `familias`/`criterios`: mantém linhas dessas famílias / com algum desses critérios;
+    - `min_gravidade`: gravidade mínima (linhas só com IQR, sem escore, ficam quando for 0);
+    - `quedas`: só saltos sinalizados que são quedas entre edições.
+    """
+    mask = pd.Series(True, index=report.index)
+    if familias:
+        mask &= report["família"].isin(list(familias))
+    if criterios:
+        marcados = report["critérios"].str.split(", ")
+        mask &= marcados.map(lambda cs: any(c in criterios for c in cs)).astype(bool)
+    if min_gravidade > 0:
+        mask &= report["gravidade"] >= min_gravidade
+    if quedas:
+        mask &= report["critérios"].str.contains("salto", regex=False) & (report["salto"] < 0)
+    return report[mask].reset_index(drop=True)
@@ -0,0 +1,154 @@
+"""
+Geração em lote dos arquivos publicados (rankings, séries, comparações e relatório de anomalias).
+
+    python -m ideb [ARQUIVOS ou PASTA ...] --saida saida --workers 4 --formatos csv,parquet
+
+Cada planilha é lida e preparada uma única vez (o processo principal aquece o
+cache em disco); os workers do pool só fazem memory-map do cache Feather.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .catalog import scan_catalog
+from .compare import compare_bar
+from .dataset import open_dataset
+from .export import safe_filename, to_csv_bytes
+from .loading import HAS_ARROW
+from .ranking import rank_municipios
+from .reshape import family_timeseries
+
+FORMATOS = ("csv", "parquet")
+
+# bases abertas neste processo (cada worker abre cada planilha no máximo uma vez)
+_BASES: dict = {}
+
+def _base(path: str, sheet_name) -> dict:
+    chave = (path, sheet_name)
+    if chave not in _BASES:
+        _BASES[chave] = open_dataset(path, sheet_name)
+    return _BASES[chave]
+
+def _write(df: pd.DataFrame, pasta: str, nome: str, formatos) -> list[str]:
+    os.makedirs(pasta, exist_ok=True)
+    gerados = []
+    if "csv" in formatos:
+        destino = os.path.join(pasta, f"{nome}.csv")
+        with open(destino, "wb") as f:
+            f.write(to_csv_bytes(df))
+        gerados.append(destino)
+    if "parquet" in formatos:
+        destino = os.path.join(pasta, f"{nome}.parquet")
+        df.to_parquet(destino, index=False)
+        gerados.append(destino)
+    return gerados
+
+def run_task(task: dict) -> list[str]:
+    """
+    Executa um lote de um tipo para uma planilha:
+    - "ranking": cada métrica nas duas ordens (todas as posições);
+    - "serie": cada família, todos os municípios, média anual dos subperíodos;
+    - "comparador": cada (família, ano), todos os municípios, maior -> menor;
+    - "anomalias": o relatório de valores suspeitos da planilha, para revisão antes de publicar.
+    """
+    base = _base(task["caminho"], task["aba"])
+    pasta = os.path.join(task["saida"], task["tipo"])
+    gerados = []
+    if task["tipo"] == "ranking":
+        for metrica in task["itens"]:
+            for sufixo, asc in [("desc", False), ("asc", True)]:
+                df = rank_municipios(base["ranking"], metrica, ascending=asc)
+                gerados += _write(df, pasta, safe_filename(f"ranking_municipios_{metrica}_{sufixo}"), task["formatos"])
+    elif task["tipo"] == "serie":
+        todos = base["municipios"]["opcoes"]
+        for familia in task["itens"]:
+            df = family_timeseries(base["long"], familia, todos)
+            gerados += _write(df, pasta, f"serie_temporal_{familia}", task["formatos"])
+    elif task["tipo"] == "comparador":
+        todos = base["municipios"]["opcoes"]
+        for familia, ano in task["itens"]:
+            df = compare_bar(base["cube"], familia, ano, todos)
+            gerados += _write(df, pasta, f"comparador_{familia}_{ano}", task["formatos"])
+    elif task["tipo"] == "anomalias":
+        gerados += _write(base["anomalias"], pasta, "relatorio_anomalias", task["formatos"])
+    return gerados
+
+def _chunks(itens: list, n: int) -> list[list]:
+    n = max(1, min(n, len(itens)))
+    return [itens[i::n] for i in range(n)] if itens else []
+
+def plan_tasks(entradas: list[dict], saida: str, formatos, workers: int) -> list[dict]:
+    """Divide o trabalho de cada planilha em lotes por tipo, para distribuir entre os workers."""
+    tasks = []
+    for item in entradas:
+        # abre aqui uma vez: grava o cache em disco que os workers vão ler
+        base = _base(item["caminho"], item["aba"])
+        stem = os.path.splitext(os.path.basename(item["caminho"]))[0]
+        destino = os.path.join(saida, stem if item["aba"] == 0 else f"{stem}_{item['aba']}")
+        por_tipo = {
+            "ranking": list(base["ranking"]["ordens"]),
+            "serie": sorted(base["schema"]["familias"]),
+            "comparador": [(f, a) for f in sorted(base["schema"]["familias"])
+                           for a in sorted(base["schema"]["familias"][f])],
+            "anomalias": ["relatório"],
+        }
+        for tipo, itens in por_tipo.items():
+            for lote in _chunks(itens, workers):
+                tasks.append({"caminho": item["caminho"], "aba": item["aba"], "tipo": tipo,
+                              "itens": lote, "saida": destino, "formatos": tuple(formatos)})
+    return tasks
+
+def _entradas(caminhos: list[str], aba) -> list[dict]:
+    entradas = []
+    for c in caminhos or ["."]:
+        if os.path.isdir(c):
+            entradas += [{"caminho": d["caminho"], "aba": d["aba"]} for d in scan_catalog(c)]
+        else:
+            entradas.append({"caminho": c, "aba": aba})
+    return entradas
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m ideb",
+        description="Gera rankings, séries temporais, tabelas do comparador e o relatório de anomalias "
+                    "para todas as métricas.",
+    )
+    parser.add_argument("entradas", nargs="*", help="planilhas .xlsx, arquivos .csv por escola ou pastas (padrão: pasta atual)")
+    parser.add_argument("--aba", default=0, help="aba das planilhas informadas diretamente (padrão: 0)")
+    parser.add_argument("--saida", default="saida", help="pasta de saída (padrão: saida)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processos em paralelo (padrão: nº de CPUs; 1 = sem pool)")
+    parser.add_argument("--formatos", default="csv,parquet", help="csv, parquet ou ambos (separados por vírgula)")
+    args = parser.parse_args(argv)
+
+    formatos = [f.strip().lower() for f in args.formatos.split(",") if f.strip()]
+    invalidos = [f for f in formatos if f not in FORMATOS]
+    if invalidos:
+        parser.error(f"formato(s) inválido(s): {', '.join(invalidos)}")
+    if "parquet" in formatos and not HAS_ARROW:
+        print("aviso: pyarrow não instalado; gerando apenas CSV.", file=sys.stderr)
+        formatos = [f for f in formatos if f != "parquet"]
+    aba = int(args.aba) if str(args.aba).isdigit() else args.aba
+
+    inicio = time.perf_counter()
+    tasks = plan_tasks(_entradas(args.entradas, aba), args.saida, formatos, args.workers)
+    if not tasks:
+        print("Nenhuma planilha encontrada.", file=sys.stderr)
+        return 1
+
+    gerados = []
+    if args.workers <= 1:
+        for t in tasks:
+            gerados += run_task(t)
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for fut in as_completed([pool.submit(run_task, t) for t in tasks]):
+                gerados += fut.result()
+
+    print(f"{len(gerados)} arquivos gerados em '{args.saida}' "
+          f"({len(tasks)} lotes, {time.perf_counter() - inicio:.1f}s).")
+    return 0
@@ -0,0 +1,100 @@
+"""Catálogo de bases disponíveis (UFs / edições / etapas), sem abrir as planilhas."""
+import json
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+MANIFEST = "datasets.json"
+# tabelas do Censo Escolar (CENSO_<descrição>_<ano>[_<UF>]): fonte complementar, não são bases
+CENSO_PREFIXO = "CENSO_"
+
+ETAPAS = {
+    "ensino_medio": "Ensino Médio",
+    "anos_iniciais": "Ensino Fundamental – Anos Iniciais",
+    "anos_finais": "Ensino Fundamental – Anos Finais",
+}
+
+_ARQUIVO_RE = re.compile(
+    r"^IDEB_(?P<etapa>.+?)_(?P<nivel>municipios|escolas)_(?P<ano>\d{4})_(?P<uf>[A-Za-z]{2})$",
+    re.IGNORECASE,
+)
+
+def _catalog_entry(caminho: str, aba=0, **extra) -> dict:
+    """Monta um item do catálogo a partir do nome do arquivo (padrão IDEB_<etapa>_<nível>_<ano>_<UF>)."""
+    stem = os.path.splitext(os.path.basename(caminho))[0]
+    m = _ARQUIVO_RE.match(stem)
+    if m:
+        etapa = ETAPAS.get(m["etapa"].lower(), m["etapa"].replace("_", " ").title())
+        uf, ano, nivel = m["uf"].upper(), int(m["ano"]), m["nivel"].lower()
+    else:
+        etapa, uf, ano = stem, "", None
+        nivel = "escolas" if caminho.lower().endswith(".csv") else "municipios"
+    item = {"caminho": caminho, "aba": aba, "etapa": etapa, "uf": uf, "ano": ano, "nivel": nivel}
+    item.update({k: v for k, v in extra.items() if v is not None})
+    if "rotulo" not in item:
+        item["rotulo"] = " — ".join(str(x) for x in [item["etapa"], item["uf"], item["ano"]] if x)
+        if item["nivel"] == "escolas":
+            item["rotulo"] += " (escolas, agregado por município)"
+    return item
+
+def list_sheets(path: str) -> list[str]:
+    """
+    Nomes das abas de um .xlsx lendo só `xl/workbook.xml` do zip (não parseia as
+    planilhas nem as strings compartilhadas). Arquivos ilegíveis retornam [].
+    """
+    try:
+        with zipfile.ZipFile(path) as z:
+            root = ElementTree.fromstring(z.read("xl/workbook.xml"))
+    except (OSError, KeyError, zipfile.BadZipFile, ElementTree.ParseError):
+        return []
+    return [el.get("name") for el in root.iter() if el.tag.endswith("}sheet") or el.tag == "sheet"]
+
+def _data_files(data_dir: str) -> list[str]:
+    """`*.xlsx` e `*.csv` de `data_dir` e `data_dir/dados/` (sem temporários do Excel)."""
+    arquivos = []
+    for pasta in [data_dir, os.path.join(data_dir, "dados")]:
+        if not os.path.isdir(pasta):
+            continue
+        for name in sorted(os.listdir(pasta)):
+            if name.lower().endswith((".xlsx", ".csv")) and not name.startswith(("~$", ".")):
+                arquivos.append(os.path.join(pasta, name))
+    return arquivos
+
+def scan_censo(data_dir: str = ".") -> list[str]:
+    """Tabelas do Censo Escolar (`CENSO_*.xlsx|csv`) em `data_dir` e `data_dir/dados/`."""
+    return [c for c in _data_files(data_dir) if os.path.basename(c).upper().startswith(CENSO_PREFIXO)]
+
+def scan_catalog(data_dir: str = ".") -> list[dict]:
+    """
+    Lista as bases disponíveis SEM abrir nenhuma planilha.
+    - Se existir `datasets.json` em `data_dir`, ele manda: lista de objetos com
+      "arquivo" (obrigatório) e, opcionalmente, "aba", "etapa", "uf", "ano", "nivel", "rotulo".
+    - Senão, varre `*.xlsx` e `*.csv` em `data_dir` e `data_dir/dados/`; cada aba de
+      um .xlsx com várias abas vira uma base
+      (CSV e arquivos `IDEB_<etapa>_escolas_...` são bases por escola, ver `ideb.escolas`;
+      `CENSO_*` fica de fora, ver `scan_censo`).
+    """
+    manifest = os.path.join(data_dir, MANIFEST)
+    if os.path.exists(manifest):
+        with open(manifest, encoding="utf-8") as f:
+            itens = json.load(f)
+        return [
+            _catalog_entry(os.path.join(data_dir, it.pop("arquivo")), it.pop("aba", 0), **it)
+            for it in itens
+        ]
+
+    itens = []
+    for c in _data_files(data_dir):
+        if os.path.basename(c).upper().startswith(CENSO_PREFIXO):
+            continue
+        abas = list_sheets(c) if c.lower().endswith(".xlsx") else []
+        if len(abas) <= 1:
+            itens.append(_catalog_entry(c))
+            continue
+        # pasta de trabalho com várias abas (edições/indicadores): uma base por aba
+        for aba in abas:
+            item = _catalog_entry(c, aba)
+            item["rotulo"] += f" — {aba}"
+            itens.append(item)
+    return sorted(itens, key=lambda d: (d["etapa"], d["uf"], -(d["ano"] or 0)))
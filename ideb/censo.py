@@ -0,0 +1,196 @@
+"""
+Censo Escolar (taxas de rendimento/aprovação) alinhado à base IDEB por município.
+
+- Cabeçalhos do INEP ("Código do Município", "Dependência Administrativa", ...) são
+  trazidos para os nomes da base IDEB (CO_MUNICIPIO, REDE, ...);
+- o pareamento usa o código do município como inteiro (índice ordenado) e,
+  para o que sobrar, o nome normalizado (sem acento/caixa);
+- as métricas viram famílias com ano (CENSO_<métrica>_<ano>), prontas para o cubo.
+"""
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from .catalog import CENSO_PREFIXO
+from .cleaning import _muni_code_col, _muni_name_col, _parse_numeric, get_muni_label_col, normalize_rede
+from .escolas import _csv_dialect
+from .municipios import normalize_text
+from .reshape import build_cube, build_long_table
+from .schema import build_schema_index, parse_metric_col
+
+_CENSO_ARQUIVO_RE = re.compile(r"^CENSO_.*?_(?P<ano>\d{4})(?:_(?P<uf>[A-Za-z]{2}))?$", re.IGNORECASE)
+
+# cabeçalhos das planilhas do INEP -> nomes usados na base IDEB (comparação sem acento/caixa)
+_ALIASES = {
+    "codigo do municipio": "CO_MUNICIPIO",
+    "cod. municipio": "CO_MUNICIPIO",
+    "nome do municipio": "NO_MUNICIPIO",
+    "municipio": "NO_MUNICIPIO",
+    "dependencia administrativa": "REDE",
+    "dependencia": "REDE",
+    "tp_dependencia": "REDE",
+    "localizacao": "LOCALIZACAO",
+    "ano": "ANO",
+    "nu_ano_censo": "ANO",
+    "uf": "SG_UF",
+    "sigla": "SG_UF",
+}
+# colunas de identificação: nunca viram métrica
+_ID_COLS = {"CO_MUNICIPIO", "NO_MUNICIPIO", "REDE", "LOCALIZACAO", "ANO", "SG_UF", "CO_UF", "NO_UF", "REGIAO"}
+
+def censo_file_info(path: str) -> dict:
+    """{"ano", "uf"} a partir do nome CENSO_<descrição>_<ano>[_<UF>] (None quando ausentes)."""
+    m = _CENSO_ARQUIVO_RE.match(os.path.splitext(os.path.basename(path))[0])
+    if not m:
+        return {"ano": None, "uf": None}
+    return {"ano": int(m["ano"]), "uf": m["uf"].upper() if m["uf"] else None}
+
+def _header_row(raw: pd.DataFrame, max_rows: int = 30) -> int:
+    """Linha do cabeçalho: a primeira que contém a coluna de código do município."""
+    for i in range(min(max_rows, len(raw))):
+        nomes = [_ALIASES.get(normalize_text(c).strip(), str(c).strip()) for c in raw.iloc[i] if pd.notna(c)]
+        if _muni_code_col(pd.DataFrame(columns=nomes)) is not None:
+            return i
+    raise ValueError("Tabela do Censo sem coluna de código do município.")
+
+def read_censo(path: str, sheet_name=0) -> pd.DataFrame:
+    """Lê a tabela do Censo (xlsx ou csv) pulando as linhas de título do INEP."""
+    if path.lower().endswith(".csv"):
+        sep, encoding = _csv_dialect(path)
+        raw = pd.read_csv(path, sep=sep, encoding=encoding, dtype=str, header=None)
+    else:
+        raw = pd.read_excel(path, engine="openpyxl", sheet_name=sheet_name, header=None)
+    h = _header_row(raw)
+    df = raw.iloc[h + 1:].reset_index(drop=True)
+    df.columns = [_ALIASES.get(normalize_text(c).strip(), str(c).strip()) for c in raw.iloc[h]]
+    return df.dropna(how="all")
+
+def load_censo(path: str, sheet_name=0) -> pd.DataFrame:
+    """Lê e prepara uma tabela do Censo; ano e UF padrão vêm do nome do arquivo."""
+    info = censo_file_info(path)
+    return prepare_censo(read_censo(path, sheet_name), ano=info["ano"], uf=info["uf"])
+
+def prepare_censo(raw: pd.DataFrame, ano: int | None = None, uf: str | None = None,
+                  rede: str = "Estadual") -> pd.DataFrame:
+    """
+    Tabela do Censo por município, indexada pelo código inteiro:
+    - filtra `rede` (coluna REDE/dependência), `uf` e localização "Total" quando existirem;
+    - métricas numéricas viram CENSO_<métrica>_<ano> (ano da coluna ANO, do nome da
+      métrica ou `ano`); municípios repetidos são agregados pela média;
+    - mantém NO_MUNICIPIO (primeiro nome visto) para o pareamento por nome; linhas sem
+      código ficam no fim, agregadas pelo nome, com CO_MUNICIPIO <NA>.
+    """
+    code_col, name_col = _muni_code_col(raw), _muni_name_col(raw)
+    df = raw
+    if "REDE" in df.columns and rede:
+        df = df[df["REDE"].map(normalize_rede) == rede]
+    if "LOCALIZACAO" in df.columns:
+        total = df["LOCALIZACAO"].astype(str).str.strip().str.casefold() == "total"
+        if total.any():
+            df = df[total]
+    if uf and "SG_UF" in df.columns:
+        df = df[df["SG_UF"].astype(str).str.strip().str.upper() == uf.upper()]
+
+    codigos = pd.to_numeric(df[code_col], errors="coerce")
+    # linhas sem código ficam se tiverem nome: servem só ao pareamento por nome em `join_censo`
+    nomes = df[name_col].astype(str).str.strip().where(df[name_col].notna(), "") if name_col is not None else None
+    manter = codigos.notna() if nomes is None else codigos.notna() | (nomes != "")
+    df, codigos = df[manter.to_numpy()], codigos[manter].to_numpy(dtype=float)
+    if nomes is not None:
+        nomes = pd.Series(nomes[manter].to_numpy())
+    anos = (pd.to_numeric(df["ANO"], errors="coerce").to_numpy() if "ANO" in df.columns
+            else np.full(len(df), np.nan if ano is None else ano))
+
+    blocos = {}
+    for pos, col in enumerate(df.columns):
+        if col in _ID_COLS or col in (code_col, name_col):
+            continue
+        valores = _parse_numeric(df.iloc[:, pos])
+        if valores.notna().mean() < 0.60:
+            continue
+        parsed = parse_metric_col(str(col))
+        metrica = re.sub(r"\W+", "_", normalize_text(col)).strip("_").upper()
+        if parsed is not None:
+            blocos[f"{CENSO_PREFIXO}{metrica}"] = valores.to_numpy(dtype=float)
+            continue
+        for a in pd.unique(anos[~np.isnan(anos)]):
+            sel = anos == a
+            coluna = np.where(sel, valores.to_numpy(dtype=float), np.nan)
+            blocos[f"{CENSO_PREFIXO}{metrica}_{int(a)}"] = coluna
+
+    metricas = pd.DataFrame(blocos, index=pd.RangeIndex(len(df)))
+    com = ~np.isnan(codigos)
+    out = metricas[com].groupby(codigos[com].astype("int64")).mean()
+    out.index = out.index.astype("Int64").rename("CO_MUNICIPIO")
+    if nomes is not None:
+        out.insert(0, "NO_MUNICIPIO", nomes[com].groupby(codigos[com].astype("int64")).first().to_numpy())
+        if not com.all():
+            # sem código: agregadas pelo nome normalizado, com CO_MUNICIPIO <NA>, depois das com código
+            chave = nomes[~com].map(normalize_text)
+            sem = metricas[~com].groupby(chave, sort=False).mean()
+            sem.insert(0, "NO_MUNICIPIO", nomes[~com].groupby(chave, sort=False).first())
+            sem = sem[sem.iloc[:, 1:].notna().any(axis=1)]
+            sem.index = pd.Index([pd.NA] * len(sem), dtype="Int64", name="CO_MUNICIPIO")
+            out = pd.concat([out, sem])
+    return out
+
+def join_censo(df: pd.DataFrame, censo: pd.DataFrame) -> pd.DataFrame:
+    """
+    Alinha as métricas do Censo às linhas da base IDEB (mesmo índice/ordem de `df`):
+    1) código do município como inteiro, via `searchsorted` no índice ordenado do Censo
+       (códigos de 6 dígitos do Censo casam com os de 7 da base ignorando o dígito verificador);
+    2) linhas sem par pelo código: nome normalizado.
+    `attrs["pareamento"]` conta {"codigo", "nome", "sem_par"}.
+    """
+    metricas = censo.drop(columns=["NO_MUNICIPIO"], errors="ignore")
+    n = len(df)
+    alvo = np.full(n, -1, dtype=np.int64)
+
+    code_col = _muni_code_col(df)
+    # índice de busca só com as linhas que têm código (as sem código entram no passo do nome)
+    linhas = np.flatnonzero(censo.index.notna())
+    chaves = censo.index[linhas].to_numpy(dtype=np.int64)
+    if code_col is not None and len(chaves):
+        codigos = pd.to_numeric(df[code_col], errors="coerce").to_numpy(dtype=float)
+        ok = ~np.isnan(codigos)
+        cod = np.where(ok, codigos, -1).astype(np.int64)
+        if chaves.max() < 1_000_000 <= cod.max():
+            cod = np.where(ok, cod // 10, -1)
+        pos = np.clip(np.searchsorted(chaves, cod), 0, len(chaves) - 1)
+        achou = ok & (chaves[pos] == cod)
+        alvo[achou] = linhas[pos[achou]]
+    por_codigo = int((alvo >= 0).sum())
+
+    name_col = _muni_name_col(df)
+    if name_col is not None and "NO_MUNICIPIO" in censo.columns and (alvo < 0).any():
+        por_nome = {}
+        for i, nome in enumerate(censo["NO_MUNICIPIO"].to_numpy()):
+            por_nome.setdefault(normalize_text(nome), i)
+        faltam = np.flatnonzero(alvo < 0)
+        nomes = df[name_col].to_numpy()
+        for i in faltam:
+            if pd.notna(nomes[i]):
+                alvo[i] = por_nome.get(normalize_text(nomes[i]), -1)
+
+    # fancy-index pelas posições pareadas; sem par -> NaN
+    valores = np.vstack([metricas.to_numpy(dtype=float), np.full((1, metricas.shape[1]), np.nan)])
+    out = pd.DataFrame(valores[np.where(alvo >= 0, alvo, -1)], columns=metricas.columns, index=df.index)
+    out.attrs["pareamento"] = {
+        "codigo": por_codigo,
+        "nome": int((alvo >= 0).sum()) - por_codigo,
+        "sem_par": int((alvo < 0).sum()),
+    }
+    return out
+
+def build_censo_cube(df: pd.DataFrame, censos: list[pd.DataFrame]) -> tuple[pd.DataFrame, list[dict]]:
+    """
+    Cubo (família, ano, Município) só das famílias CENSO_*, rotulado como a base IDEB
+    (concatenável com `build_cube` da base), e o pareamento de cada tabela.
+    """
+    _, label_col = get_muni_label_col(df)
+    blocos = [join_censo(df, c) for c in censos]
+    tab = pd.concat([df[[label_col]], *blocos], axis=1)
+    cube = build_cube(build_long_table(tab, build_schema_index(tab.columns), label_col))
+    return cube, [b.attrs["pareamento"] for b in blocos]
@@ -0,0 +1,212 @@
+"""
+Especificações Vega-Lite dos gráficos do painel, como dicts (sem Altair).
+
+Cada construtor devolve (dados, spec): o spec não carrega linhas, os dados seguem
+à parte (o Streamlit os envia em Arrow). Acima de `max_rows` linhas, séries e
+dispersões são agregadas aqui (faixa min–máx + média; grade de contagem),
+então o navegador recebe poucas linhas em vez da seleção inteira. No mapa, a
+malha é uma fonte à parte (URL estática) e só os valores viajam com o gráfico.
+"""
+import numpy as np
+import pandas as pd
+
+# acima disso, séries e dispersões viram marcas agregadas
+CHART_MAX_ROWS = 5000
+# resolução da grade da dispersão agregada (bins por eixo)
+SCATTER_BINS = 30
+
+def _field(nome: str) -> str:
+    # '.', '[' e ']' têm significado em nomes de campo do Vega-Lite
+    return str(nome).replace(".", "\\.").replace("[", "\\[").replace("]", "\\]")
+
+def _enc(nome: str, tipo: str, **extra) -> dict:
+    return {"field": _field(nome), "type": tipo, **extra}
+
+def bar_chart(df: pd.DataFrame, x: str, y: str, titulo_x: str | None = None,
+              titulo_y: str | None = None, tooltip: list[str] | None = None) -> tuple[pd.DataFrame, dict]:
+    """Barras ordenadas pelo valor (as visões de barras já chegam limitadas a um Top N)."""
+    tooltip = tooltip or [x, y]
+    data = df[list(dict.fromkeys(tooltip + [x, y]))].copy()
+    data[x] = data[x].astype(str)
+    spec = {
+        "mark": {"type": "bar"},
+        "encoding": {
+            "x": _enc(x, "nominal", sort="-y", axis={"labelAngle": -40, "title": titulo_x or x}),
+            "y": _enc(y, "quantitative", title=titulo_y or y),
+            "tooltip": [_enc(c, "quantitative" if pd.api.types.is_numeric_dtype(data[c]) else "nominal")
+                        for c in tooltip],
+        },
+        "height": 420,
+    }
+    return data, spec
+
+def series_chart(long_df: pd.DataFrame, familia: str, media: bool = False,
+                 max_rows: int = CHART_MAX_ROWS) -> tuple[pd.DataFrame, dict]:
+    """
+    Série temporal (Município, ano, valor):
+    - até `max_rows` linhas: uma linha por município; `media` sobrepõe a média dos selecionados
+      (calculada no próprio Vega-Lite, sem repetir as linhas);
+    - acima: faixa mínimo–máximo e linha da média por ano.
+    """
+    x = {"field": "ano", "type": "ordinal", "title": "Ano", "sort": "ascending"}
+    if len(long_df) <= max_rows:
+        data = long_df.assign(Município=long_df["Município"].astype(str))
+        camadas = [{
+            "mark": {"type": "line", "point": True},
+            "encoding": {
+                "x": x,
+                "y": {"field": "valor", "type": "quantitative", "title": familia},
+                "color": {"field": "Município", "type": "nominal", "title": "Município"},
+                "tooltip": [{"field": "Município", "type": "nominal"}, {"field": "ano", "type": "ordinal"},
+                            {"field": "valor", "type": "quantitative", "format": ".3f"}],
+            },
+        }]
+        if media:
+            camadas.append({
+                "transform": [{"aggregate": [{"op": "mean", "field": "valor", "as": "valor"}], "groupby": ["ano"]}],
+                "mark": {"type": "line", "point": True, "strokeDash": [6, 3], "color": "black"},
+                "encoding": {
+                    "x": x,
+                    "y": {"field": "valor", "type": "quantitative"},
+                    "tooltip": [{"field": "valor", "type": "quantitative", "format": ".3f"},
+                                {"field": "ano", "type": "ordinal"}],
+                },
+            })
+        return data, {"layer": camadas, "height": 420}
+
+    data = (
+        long_df.groupby("ano")["valor"]
+        .agg(media="mean", minimo="min", maximo="max")
+        .reset_index()
+    )
+    y = {"type": "quantitative", "title": familia}
+    spec = {
+        "layer": [
+            {"mark": {"type": "area", "opacity": 0.3},
+             "encoding": {"x": x, "y": {"field": "minimo", **y}, "y2": {"field": "maximo"}}},
+            {"mark": {"type": "line", "point": True},
+             "encoding": {"x": x, "y": {"field": "media", **y},
+                          "tooltip": [{"field": "ano", "type": "ordinal"},
+                                      {"field": "media", "type": "quantitative", "format": ".3f"},
+                                      {"field": "minimo", "type": "quantitative", "format": ".3f"},
+                                      {"field": "maximo", "type": "quantitative", "format": ".3f"}]}},
+        ],
+        "height": 420,
+        "title": {"text": "", "subtitle": f"{long_df['Município'].nunique()} municípios: média e faixa mín–máx"},
+    }
+    return data, spec
+
+def _fit_layer(scatter_df: pd.DataFrame, ajuste: dict) -> dict:
+    """Reta ajustada como camada com os dois pontos extremos (dados próprios, inline)."""
+    x0, x1 = float(scatter_df["X"].min()), float(scatter_df["X"].max())
+    a, b = ajuste["inclinação"], ajuste["intercepto"]
+    return {
+        "data": {"values": [{"X": x0, "Y": a * x0 + b}, {"X": x1, "Y": a * x1 + b}]},
+        "mark": {"type": "line", "color": "firebrick", "strokeDash": [4, 2]},
+        "encoding": {"x": {"field": "X", "type": "quantitative"}, "y": {"field": "Y", "type": "quantitative"}},
+    }
+
+def scatter_chart(scatter_df: pd.DataFrame, titulo_x: str, titulo_y: str,
+                  max_rows: int = CHART_MAX_ROWS, bins: int = SCATTER_BINS,
+                  ajuste: dict | None = None) -> tuple[pd.DataFrame, dict]:
+    """
+    Dispersão (Município, X, Y):
+    - até `max_rows` pontos: círculos rotulados pelo município;
+    - acima: grade `bins` x `bins` colorida pela contagem de municípios;
+    - `ajuste` ({"inclinação", "intercepto"}, ver `ideb.stats.ols_fit`): desenha a reta.
+    """
+    if len(scatter_df) <= max_rows:
+        data = scatter_df.assign(Município=scatter_df["Município"].astype(str))
+        x = {"field": "X", "type": "quantitative", "title": titulo_x}
+        y = {"field": "Y", "type": "quantitative", "title": titulo_y}
+        spec = {
+            "layer": [
+                {"mark": {"type": "circle", "size": 120},
+                 "encoding": {"x": x, "y": y,
+                              "tooltip": [{"field": "Município", "type": "nominal"},
+                                          {"field": "X", "type": "quantitative", "format": ".3f"},
+                                          {"field": "Y", "type": "quantitative", "format": ".3f"}]}},
+                {"mark": {"type": "text", "align": "left", "dx": 7, "dy": 3},
+                 "encoding": {"x": x, "y": y, "text": {"field": "Município", "type": "nominal"}}},
+            ],
+        }
+        if ajuste:
+            spec["layer"].append(_fit_layer(scatter_df, ajuste))
+        return data, spec
+
+    n, ex, ey = np.histogram2d(scatter_df["X"].to_numpy(float), scatter_df["Y"].to_numpy(float), bins=bins)
+    ix, iy = np.nonzero(n)
+    data = pd.DataFrame({
+        "x_ini": ex[ix], "x_fim": ex[ix + 1],
+        "y_ini": ey[iy], "y_fim": ey[iy + 1],
+        "municípios": n[ix, iy].astype(int),
+    })
+    grade = {
+        "mark": {"type": "rect"},
+        "encoding": {
+            "x": {"field": "x_ini", "type": "quantitative", "title": titulo_x},
+            "x2": {"field": "x_fim"},
+            "y": {"field": "y_ini", "type": "quantitative", "title": titulo_y},
+            "y2": {"field": "y_fim"},
+            "color": {"field": "municípios", "type": "quantitative", "title": "Municípios"},
+            "tooltip": [{"field": "municípios", "type": "quantitative"}],
+        },
+    }
+    if not ajuste:
+        return data, grade
+    return data, {"layer": [grade, _fit_layer(scatter_df, ajuste)]}
+
+def heatmap_chart(matriz: pd.DataFrame, titulo: str = "r") -> tuple[pd.DataFrame, dict]:
+    """
+    Mapa de calor de uma matriz de correlação com colunas (família, ano):
+    uma célula por par, escala divergente fixa em [-1, 1].
+    """
+    rotulos = [f"{fam} {ano}" for fam, ano in matriz.columns]
+    data = pd.DataFrame({
+        "X": np.repeat(rotulos, len(rotulos)),
+        "Y": np.tile(rotulos, len(rotulos)),
+        "r": matriz.to_numpy().ravel(),
+    }).dropna()
+    spec = {
+        "mark": {"type": "rect"},
+        "encoding": {
+            "x": {"field": "X", "type": "nominal", "sort": rotulos, "title": None, "axis": {"labelAngle": -45}},
+            "y": {"field": "Y", "type": "nominal", "sort": rotulos, "title": None},
+            "color": {"field": "r", "type": "quantitative", "title": titulo,
+                      "scale": {"scheme": "redblue", "domain": [-1, 1]}},
+            "tooltip": [{"field": "X", "type": "nominal"}, {"field": "Y", "type": "nominal"},
+                        {"field": "r", "type": "quantitative", "format": ".3f"}],
+        },
+        "height": max(240, 18 * len(rotulos)),
+    }
+    return data, spec
+
+def choropleth_chart(valores: pd.DataFrame, malha: dict, titulo: str) -> tuple[pd.DataFrame, dict]:
+    """
+    Mapa coroplético: `valores` ("codigo", "Município", "valor") seguem como dados do
+    gráfico e a geometria vem de `malha` (fonte Vega-Lite TopoJSON: {"url": ...} ou
+    {"values": ...}, com "format"), ligada pelo `id` de cada município via lookup.
+    Com `url`, trocar de métrica reenvia só as linhas de valores; municípios sem valor
+    ficam em cinza na camada de fundo.
+    """
+    data = valores[["codigo", "Município", "valor"]]
+    forma = {"stroke": "white", "strokeWidth": 0.5}
+    spec = {
+        "layer": [
+            {"data": malha, "mark": {"type": "geoshape", "fill": "#e6e6e6", **forma}},
+            {
+                "transform": [{"lookup": "codigo", "from": {"data": malha, "key": "id"}, "as": "geo"}],
+                "mark": {"type": "geoshape", **forma},
+                "encoding": {
+                    "shape": {"field": "geo", "type": "geojson"},
+                    "color": {"field": "valor", "type": "quantitative", "title": titulo,
+                              "scale": {"scheme": "viridis"}},
+                    "tooltip": [{"field": "Município", "type": "nominal"},
+                                {"field": "valor", "type": "quantitative", "format": ".3f"}],
+                },
+            },
+        ],
+        "projection": {"type": "mercator"},
+        "height": 560,
+    }
+    return data, spec
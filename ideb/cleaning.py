@@ -0,0 +1,152 @@
+"""Limpeza e tipagem da planilha IDEB: números, textos agrupados, REDE e colunas de município."""
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, is_object_dtype, is_string_dtype
+
+# colunas que NUNCA vamos converter para número (busca por trecho do nome)
+NEVER_NUMERIC_KEYS = (
+    "no_municipio", "município", "municipio",
+    "rede", "sg_uf", "uf",
+    "nome", "descricao", "descrição", "desc",
+)
+
+def _parse_numeric(s: pd.Series) -> pd.Series:
+    """
+    Converte uma coluna para float: uma troca vetorizada de ',' por '.' e um `pd.to_numeric`.
+    - nulos textuais do INEP ('-', 'None', 'nan', 'NA', '') não têm mapeamento próprio: viram NaN
+      no `errors="coerce"`, como qualquer texto não numérico (espaços nas pontas são ignorados);
+    - colunas `object` mistas (números e textos) passam por `astype(str)` antes da troca.
+    """
+    if is_numeric_dtype(s):
+        return pd.to_numeric(s, errors="coerce")
+    if not is_string_dtype(s) or is_object_dtype(s):
+        s = s.astype(str)
+    return pd.to_numeric(s.str.replace(",", ".", regex=False), errors="coerce")
+
+def infer_numeric_types(df: pd.DataFrame, min_ratio: float = 0.60) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Tipagem da base em uma passada por coluna (por POSIÇÃO, então aceita nomes duplicados).
+    - Colunas textuais fora de `NEVER_NUMERIC_KEYS` viram numéricas se >= `min_ratio`
+      das células forem números (vírgula decimal e nulos textuais tratados);
+      as demais viram texto legível (`astype(str)`).
+    - Retorna (DataFrame tipado, nomes das colunas convertidas para número).
+    """
+    out = df.copy(deep=False)
+    convertidas = []
+    for pos, name in enumerate(df.columns):
+        s = df.iloc[:, pos]
+        if not (is_object_dtype(s) or is_string_dtype(s)):
+            continue
+        if any(k in str(name).lower() for k in NEVER_NUMERIC_KEYS):
+            continue
+        parsed = _parse_numeric(s)
+        # só converte se maioria virou número
+        if parsed.notna().mean() >= min_ratio:
+            out.isetitem(pos, parsed)
+            convertidas.append(name)
+        else:
+            out.isetitem(pos, s.astype(str))  # garante texto legível
+    return out, convertidas
+
+def coerce_numeric_cols(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte colunas textuais para numéricas apenas quando fizer sentido.
+    - Ignora colunas claramente categóricas (ex.: NO_MUNICIPIO, REDE, SG_UF, UF, NOME, DESCRICAO).
+    - Só converte se >= 60% das células virarem número após a tentativa.
+    - Troca vírgula por ponto antes de converter.
+    Ver `infer_numeric_types`, que também informa quais colunas foram convertidas.
+    """
+    return infer_numeric_types(df)[0]
+
+def _coerce_block(d: pd.DataFrame, cols) -> pd.DataFrame:
+    """
+    Converte para numérico as colunas indicadas.
+    - Aceita listas aninhadas (ex.: cols_x + cols_y).
+    - Funciona mesmo com NOMES DUPLICADOS, substituindo por posição (`isetitem`).
+    - Trata vírgula decimal; nulos textuais ('-', 'None', 'nan', 'NA', '') viram NaN no coerce.
+    """
+    # 1) Achata 'cols'
+    flat_cols = []
+    if isinstance(cols, (list, tuple, pd.Index, np.ndarray)):
+        for c in cols:
+            if isinstance(c, (list, tuple, pd.Index, np.ndarray)):
+                flat_cols.extend(list(c))
+            else:
+                flat_cols.append(c)
+    else:
+        flat_cols = [cols]
+
+    # 2) Converte TODAS as posições cujo rótulo foi pedido (lida com duplicados)
+    wanted = set(flat_cols)
+    d = d.copy(deep=False)
+    for pos, name in enumerate(d.columns):
+        if name in wanted and not is_numeric_dtype(d.iloc[:, pos]):
+            d.isetitem(pos, _parse_numeric(d.iloc[:, pos]))
+    return d
+
+def ffill_text_cols(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Preenche para baixo (forward-fill) colunas textuais típicas de planilhas agrupadas,
+    como NO_MUNICIPIO, REDE, SG_UF. Só preenche se a coluna existir.
+    """
+    df = df.copy()
+    candidatos = ["NO_MUNICIPIO", "REDE", "SG_UF", "UF", "NOME_MUNICIPIO", "NM_MUNICIPIO"]
+    for col in candidatos:
+        if col in df.columns:
+            df[col] = df[col].ffill()
+    return df
+
+# ---------- nomes/códigos de município ----------
+def detect_muni_col(df: pd.DataFrame) -> str:
+    """Mantida para compatibilidade (não utilizada nas seções que exibem nomes)."""
+    candidates = [c for c in df.columns if any(k in c.lower() for k in ["muni", "municí", "municipio"])]
+    return candidates[0] if candidates else df.columns[0]
+
+def _muni_name_col(df: pd.DataFrame) -> str | None:
+    prefer = ["NO_MUNICIPIO", "NOME_MUNICIPIO", "NM_MUNICIPIO", "MUNICIPIO"]
+    for c in prefer:
+        if c in df.columns:
+            return c
+    # genérico: qualquer coluna com "muni" que NÃO comece com CO/CD/COD/ID
+    for c in df.columns:
+        cl = str(c).lower()
+        if "muni" in cl and not (cl.startswith("co_") or cl.startswith("cd_")
+                                 or cl.startswith("cod") or cl.startswith("id_")):
+            return c
+    return None
+
+def _muni_code_col(df: pd.DataFrame) -> str | None:
+    prefer = ["CO_MUNICIPIO", "CD_MUNICIPIO", "COD_MUNICIPIO", "ID_MUNICIPIO"]
+    for c in prefer:
+        if c in df.columns:
+            return c
+    for c in df.columns:
+        if "co_municipio" in str(c).lower():
+            return c
+    return None
+
+def get_muni_label_col(df: pd.DataFrame) -> tuple[str | None, str]:
+    """
+    Retorna (coluna_codigo, coluna_para_exibir).
+    Se houver coluna de nome, usa ela para exibir; senão usa a de código.
+    """
+    code = _muni_code_col(df)
+    name = _muni_name_col(df)
+    label = name or code or df.columns[0]
+    return code, label
+
+# ===== normalização da coluna REDE =====
+def normalize_rede(value):
+    """Padroniza rótulos de rede para facilitar o filtro."""
+    if pd.isna(value):
+        return value
+    t = str(value).strip().lower()
+    if t.startswith("estad"):
+        return "Estadual"
+    if t.startswith("munic") or t.startswith("públi") or t.startswith("publi"):
+        return "Municipal/Pública"
+    if t.startswith("feder"):
+        return "Federal"
+    if t.startswith("priv"):
+        return "Privada"
+    return str(value).strip().title()
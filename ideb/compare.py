@@ -0,0 +1,29 @@
+"""Tabelas do Comparador (barras e dispersão) a partir do cubo agregado."""
+import pandas as pd
+
+from .reshape import cube_lookup
+
+def compare_bar(cube: pd.DataFrame, familia: str, ano: int, municipios,
+                topn: int | None = None) -> pd.DataFrame:
+    """Média de (família, ano) por município, do maior para o menor (empates por nome)."""
+    comp = (
+        cube_lookup(cube, familia, ano, municipios)
+        .rename_axis("Município")
+        .reset_index()
+        .sort_values(["valor", "Município"], ascending=[False, True], kind="mergesort")
+    )
+    return comp.head(topn).reset_index(drop=True)
+
+def compare_scatter(cube: pd.DataFrame, fam_x: str, ano_x: int, fam_y: str, ano_y: int,
+                    municipios) -> pd.DataFrame:
+    """Pares (X, Y) por município; só entram municípios com valor nos dois eixos."""
+    return (
+        pd.concat(
+            {"X": cube_lookup(cube, fam_x, ano_x, municipios),
+             "Y": cube_lookup(cube, fam_y, ano_y, municipios)},
+            axis=1, join="inner",
+        )
+        .sort_index()
+        .rename_axis("Município")
+        .reset_index()
+    )
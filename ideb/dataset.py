@@ -0,0 +1,40 @@
+"""Base completa em memória: base preparada + índices + tabelas derivadas (sem Streamlit)."""
+import pandas as pd
+
+from .anomalies import build_anomalies
+from .cleaning import get_muni_label_col
+from .loading import load_prepared
+from .municipios import build_municipio_index
+from .ranking import build_ranking_index
+from .reshape import build_cube, build_long_table
+from .schema import build_schema_index
+from .trajectory import build_trajectory
+
+def derive_tables(df: pd.DataFrame) -> dict:
+    """
+    Calcula, a partir da base preparada, tudo o que as seções consomem:
+    {"df", "code_col", "label_col", "schema", "long", "cube", "municipios", "trajetoria", "ranking",
+    "anomalias"} (o ranking inclui as métricas de trajetória; "anomalias" é o relatório de
+    `build_anomalies` sobre o cubo).
+    """
+    code_col, label_col = get_muni_label_col(df)
+    schema = build_schema_index(df.columns)
+    long_df = build_long_table(df, schema, label_col)
+    trajetoria = build_trajectory(long_df, len(df))
+    cube = build_cube(long_df)
+    return {
+        "df": df,
+        "code_col": code_col,
+        "label_col": label_col,
+        "schema": schema,
+        "long": long_df,
+        "cube": cube,
+        "municipios": build_municipio_index(df),
+        "trajetoria": trajetoria,
+        "ranking": build_ranking_index(df, label_col, extra=trajetoria),
+        "anomalias": build_anomalies(cube),
+    }
+
+def open_dataset(path: str, sheet_name=0, downcast: bool = True) -> dict:
+    """Carrega (via cache em disco) e deriva uma base inteira; ver `derive_tables`."""
+    return derive_tables(load_prepared(path, sheet_name, downcast=downcast))
@@ -0,0 +1,168 @@
+"""
+Bases por escola (IDEB/Censo Escolar): leitura em blocos, filtro por rede/UF e
+agregação por município sem materializar o arquivo inteiro.
+
+O resultado tem o mesmo layout da planilha municipal (SG_UF, CO_MUNICIPIO,
+NO_MUNICIPIO, REDE + métricas com ano), então segue pelo mesmo pipeline.
+"""
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+from .catalog import _ARQUIVO_RE
+from .cleaning import _muni_code_col, _muni_name_col, _parse_numeric, normalize_rede
+from .schema import parse_metric_col
+
+# linhas por bloco lido do arquivo
+CHUNK_ROWS = 50_000
+# identificação que pode vir "agrupada" (só na primeira linha do grupo): ffill entre blocos
+ID_COLS = ("SG_UF", "CO_MUNICIPIO", "NO_MUNICIPIO", "REDE")
+
+def is_school_file(path: str) -> bool:
+    """Arquivos IDEB_<etapa>_escolas_<ano>_<UF>.(xlsx|csv) e qualquer .csv são tratados por escola."""
+    stem, ext = os.path.splitext(os.path.basename(path))
+    m = _ARQUIVO_RE.match(stem)
+    return ext.lower() == ".csv" or bool(m and m["nivel"].lower() == "escolas")
+
+def _uf_from_name(path: str) -> str | None:
+    m = _ARQUIVO_RE.match(os.path.splitext(os.path.basename(path))[0])
+    return m["uf"].upper() if m else None
+
+def _csv_dialect(path: str) -> tuple[str, str]:
+    """(separador, encoding): extrações do INEP costumam vir com ';' e em latin-1."""
+    for encoding in ("utf-8-sig", "latin-1"):
+        try:
+            with open(path, encoding=encoding) as f:
+                amostra = f.read(64 * 1024)
+            break
+        except UnicodeDecodeError:
+            continue
+    try:
+        sep = csv.Sniffer().sniff(amostra.splitlines()[0], delimiters=";,|\t").delimiter
+    except (csv.Error, IndexError):
+        sep = ";"
+    return sep, encoding
+
+def iter_chunks(path: str, sheet_name=0, chunk_rows: int = CHUNK_ROWS):
+    """
+    Gera DataFrames de até `chunk_rows` linhas, com todas as células como lidas (sem tipagem):
+    - CSV: `pd.read_csv(chunksize=...)` com separador/encoding detectados;
+    - xlsx: openpyxl em modo read_only, linha a linha.
+    """
+    if path.lower().endswith(".csv"):
+        sep, encoding = _csv_dialect(path)
+        yield from pd.read_csv(path, sep=sep, encoding=encoding, dtype=str,
+                               chunksize=chunk_rows, skipinitialspace=True)
+        return
+
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        linhas = ws.iter_rows(values_only=True)
+        header = [str(c).strip() if c is not None else f"col_{i}" for i, c in enumerate(next(linhas, ()))]
+        bloco = []
+        for row in linhas:
+            bloco.append(row)
+            if len(bloco) == chunk_rows:
+                yield pd.DataFrame(bloco, columns=header, dtype=object)
+                bloco = []
+        if bloco:
+            yield pd.DataFrame(bloco, columns=header, dtype=object)
+    finally:
+        wb.close()
+
+def aggregate_school_chunks(chunks, uf: str | None = None, rede: str = "Estadual") -> pd.DataFrame:
+    """
+    Agrega, bloco a bloco, as escolas da `rede` (e da `uf`, se informada) por município:
+    - métricas com ano (VL_..._20XX...) viram a média simples entre as escolas com valor
+      (não é o IDEB oficial do município, que o INEP calcula por rede);
+    - N_ESCOLAS conta as escolas consideradas;
+    - em memória ficam só o bloco atual e as somas/contagens por município.
+    """
+    header = None
+    metricas: list[int] = []
+    somas = contagens = n_escolas = None
+    nomes: dict = {}
+    carry: dict = {}
+
+    for chunk in chunks:
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+        if header is None:
+            header = list(chunk.columns)
+            metricas = [p for p, c in enumerate(header) if parse_metric_col(c) is not None]
+            code_col, name_col = _muni_code_col(chunk), _muni_name_col(chunk)
+            if code_col is None and name_col is None:
+                raise ValueError("Arquivo por escola sem coluna de município (código ou nome).")
+
+        # identificação agrupada: continua do último valor do bloco anterior
+        for col in ID_COLS:
+            if col in chunk.columns:
+                s = chunk[col].where(chunk[col].astype(str).str.strip().ne(""))
+                if col in carry:
+                    s.iloc[:1] = s.iloc[:1].fillna(carry[col])
+                s = s.ffill()
+                chunk[col] = s
+                if s.notna().any():
+                    carry[col] = s.dropna().iloc[-1]
+
+        keep = np.ones(len(chunk), dtype=bool)
+        if rede and "REDE" in chunk.columns:
+            keep &= (chunk["REDE"].map(normalize_rede) == rede).to_numpy()
+        if uf and "SG_UF" in chunk.columns:
+            keep &= (chunk["SG_UF"].astype(str).str.strip().str.upper() == uf.upper()).to_numpy()
+        chunk = chunk[keep]
+        if chunk.empty:
+            continue
+
+        if code_col is not None:
+            chave = pd.to_numeric(chunk[code_col], errors="coerce")
+        else:
+            chave = chunk[name_col].astype(str).str.strip()
+        valores = pd.DataFrame(
+            {i: _parse_numeric(chunk.iloc[:, p]).to_numpy(dtype=float) for i, p in enumerate(metricas)},
+            index=chunk.index,
+        )
+        g = valores.groupby(chave.to_numpy())
+        s, c, n = g.sum(min_count=1).fillna(0.0), g.count(), g.size()
+        somas = s if somas is None else somas.add(s, fill_value=0.0)
+        contagens = c if contagens is None else contagens.add(c, fill_value=0)
+        n_escolas = n if n_escolas is None else n_escolas.add(n, fill_value=0)
+
+        ident = chunk.assign(_chave=chave.to_numpy()).drop_duplicates("_chave")
+        for _, row in ident.iterrows():
+            if pd.notna(row["_chave"]) and row["_chave"] not in nomes:
+                nomes[row["_chave"]] = {
+                    "SG_UF": row.get("SG_UF", uf),
+                    "NO_MUNICIPIO": row[name_col] if name_col else None,
+                }
+
+    if somas is None:
+        cols = ["SG_UF", "CO_MUNICIPIO", "NO_MUNICIPIO", "REDE", "N_ESCOLAS"]
+        return pd.DataFrame(columns=cols + [header[p] for p in metricas] if header else cols)
+
+    medias = (somas / contagens.where(contagens > 0)).sort_index()
+    chaves = medias.index.astype("int64") if code_col is not None else medias.index
+    medias.index = chaves
+    out = pd.DataFrame({
+        "SG_UF": [nomes.get(k, {}).get("SG_UF") for k in chaves],
+        "CO_MUNICIPIO": chaves.to_numpy() if code_col is not None else pd.NA,
+        "NO_MUNICIPIO": [nomes.get(k, {}).get("NO_MUNICIPIO") for k in chaves]
+                        if code_col is not None else chaves.to_numpy(),
+        "REDE": rede,
+        "N_ESCOLAS": n_escolas.reindex(chaves).to_numpy(dtype="int64"),
+    })
+    # por posição: nomes duplicados de métrica continuam separados
+    metricas_df = pd.DataFrame(medias.to_numpy(), columns=[header[p] for p in metricas])
+    return pd.concat([out, metricas_df], axis=1)
+
+def read_school_aggregate(path: str, sheet_name=0, uf: str | None = None,
+                          chunk_rows: int = CHUNK_ROWS) -> pd.DataFrame:
+    """
+    Base municipal a partir de um arquivo por escola, lido em blocos.
+    - `uf`: padrão é a UF do nome do arquivo (IDEB_<etapa>_escolas_<ano>_<UF>); sem ela, não filtra.
+    """
+    uf = uf or _uf_from_name(path)
+    return aggregate_school_chunks(iter_chunks(path, sheet_name, chunk_rows), uf=uf)
@@ -0,0 +1,41 @@
+"""Exportação de tabelas."""
+import re
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_float_dtype
+
+# dígitos significativos de um float32: além disso é ruído da conversão para float64
+FLOAT32_DIGITS = 7
+
+def round_floats(df: pd.DataFrame, digitos: int = FLOAT32_DIGITS) -> pd.DataFrame:
+    """
+    Colunas float em float64, arredondadas coluna a coluna em casas decimais fixas:
+    `digitos` significativos do maior |valor| finito da coluna (ex.: 79.30000305 -> 79.3;
+    contagens >= 10⁷ ficam inteiras, sem notação científica). Demais colunas intactas.
+    """
+    out = df.copy(deep=False)
+    for pos, dtype in enumerate(df.dtypes):
+        if not is_float_dtype(dtype):
+            continue
+        x = df.iloc[:, pos].to_numpy(dtype=np.float64, na_value=np.nan)
+        finitos = np.abs(x[np.isfinite(x)])
+        maior = finitos.max() if len(finitos) else 0.0
+        casas = max(digitos - int(np.floor(np.log10(maior))) - 1, 0) if maior > 0 else digitos
+        out.isetitem(pos, pd.Series(np.round(x, casas), index=df.index))
+    return out
+
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """CSV em UTF-8, com os floats de `round_floats` (sem o ruído de float32, ex.: 88.049995 -> 88.05)."""
+    return round_floats(df).to_csv(index=False).encode("utf-8")
+
+def to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    """Parquet em memória (requer pyarrow); mantém os tipos, inclusive float32 e category."""
+    buf = BytesIO()
+    df.to_parquet(buf, index=False)
+    return buf.getvalue()
+
+def safe_filename(nome: str) -> str:
+    """Nome de arquivo só com letras, dígitos, "." e "-" (ex.: "Δ% 2017→2023" -> "Δ_2017_2023")."""
+    return re.sub(r"[^\w.-]+", "_", nome).strip("_")
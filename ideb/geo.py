@@ -0,0 +1,237 @@
+"""
+Malha municipal do mapa coroplético, sem rede: GeoJSON local (ex.: malha do IBGE)
+simplificado e gravado em cache como TopoJSON compacto, ou um TopoJSON já simplificado
+(como o `data/municipios_ES.topo.json` do repositório), usado como está.
+
+- simplificação Douglas–Peucker anel a anel (`tolerancia` em graus);
+- coordenadas quantizadas numa grade inteira e codificadas em deltas (TopoJSON), o
+  que reduz o arquivo a uma fração do GeoJSON original;
+- cada município leva como `id` o código IBGE de 6 dígitos (sem o verificador), que
+  casa com códigos de 6 ou 7 dígitos da base.
+
+O cache em disco é um arquivo por (versão da malha, parâmetros); o painel o serve
+como arquivo estático, então o navegador baixa a malha uma vez e só os valores mudam.
+
+Para gerar o TopoJSON do repositório a partir da malha do IBGE:
+`python -m ideb.geo municipios_ES.geojson data/municipios_ES.topo.json`.
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .loading import CACHE_DIR, file_version
+from .reshape import cube_lookup
+
+# ~200 m: abaixo de um pixel num mapa do ES com ~600 px de largura
+GEO_TOLERANCE = 0.002
+# pontos da grade em cada eixo (10⁴ no ES: resolução de ~30 m)
+GEO_QUANTIZATION = 10_000
+GEO_OBJECT = "municipios"
+# incremente quando a simplificação/formato mudar: invalida os caches em disco
+GEO_CACHE_VERSION = 1
+# propriedades com o código do município (malha do IBGE: "codarea"; shapefiles: "CD_MUN"...)
+_CODE_KEYS = ("codarea", "CD_MUN", "CD_GEOCMU", "GEOCODIGO", "CO_MUNICIPIO", "CD_MUNICIPIO", "id")
+_NAME_KEYS = ("nome", "NM_MUN", "NM_MUNICIP", "NO_MUNICIPIO", "name")
+_TOPO_EXTS = (".topo.json", ".topojson")
+
+def _stem(path: str) -> str:
+    nome = os.path.basename(path)
+    for ext in _TOPO_EXTS:
+        if nome.endswith(ext):
+            return nome[:-len(ext)]
+    return os.path.splitext(nome)[0]
+
+def muni_code6(codigo) -> int | None:
+    """Código IBGE do município sem o dígito verificador (7 -> 6 dígitos); None se não for número."""
+    try:
+        c = int(float(codigo))
+    except (TypeError, ValueError):
+        return None
+    return c // 10 if c >= 1_000_000 else c
+
+def read_geojson(path: str) -> list[dict]:
+    """
+    Municípios de um GeoJSON (FeatureCollection de Polygon/MultiPolygon):
+    [{"codigo": código de 6 dígitos, "nome": str | None, "poligonos": [[anel (n x 2), ...], ...]}].
+    Feições sem código reconhecível são ignoradas.
+    """
+    with open(path, encoding="utf-8") as f:
+        dados = json.load(f)
+    municipios = []
+    for feicao in dados.get("features", []):
+        props = feicao.get("properties") or {}
+        bruto = next((props[k] for k in _CODE_KEYS if props.get(k) is not None), feicao.get("id"))
+        codigo = muni_code6(bruto)
+        geometria = feicao.get("geometry") or {}
+        if codigo is None or geometria.get("type") not in ("Polygon", "MultiPolygon"):
+            continue
+        partes = geometria["coordinates"] if geometria["type"] == "MultiPolygon" else [geometria["coordinates"]]
+        municipios.append({
+            "codigo": codigo,
+            "nome": next((str(props[k]) for k in _NAME_KEYS if props.get(k)), None),
+            "poligonos": [[np.asarray(anel, dtype=np.float64)[:, :2] for anel in parte] for parte in partes],
+        })
+    return municipios
+
+def simplify_ring(anel: np.ndarray, tolerancia: float) -> np.ndarray:
+    """
+    Douglas–Peucker de um anel fechado (primeiro ponto = último), sem recursão: cada
+    trecho calcula as distâncias de todos os seus pontos ao segmento de uma vez.
+    Anéis que ficariam com menos de 4 pontos são mantidos como estão.
+    """
+    n = len(anel)
+    if n <= 4 or tolerancia <= 0:
+        return anel
+    manter = np.zeros(n, dtype=bool)
+    # o anel começa e termina no mesmo ponto: divide no ponto mais distante do início
+    longe = int(np.argmax(((anel - anel[0]) ** 2).sum(axis=1)))
+    manter[[0, longe, n - 1]] = True
+    pilha = [(0, longe), (longe, n - 1)]
+    while pilha:
+        i, j = pilha.pop()
+        if j <= i + 1:
+            continue
+        a, d = anel[i], anel[j] - anel[i]
+        trecho = anel[i + 1:j] - a
+        comprimento = np.hypot(d[0], d[1])
+        if comprimento == 0:
+            dist = np.hypot(trecho[:, 0], trecho[:, 1])
+        else:
+            dist = np.abs(d[0] * trecho[:, 1] - d[1] * trecho[:, 0]) / comprimento
+        k = int(np.argmax(dist))
+        if dist[k] > tolerancia:
+            m = i + 1 + k
+            manter[m] = True
+            pilha += [(i, m), (m, j)]
+    simplificado = anel[manter]
+    return simplificado if len(simplificado) >= 4 else anel
+
+def build_topology(municipios: list[dict], tolerancia: float = GEO_TOLERANCE,
+                   quantizacao: int = GEO_QUANTIZATION) -> dict:
+    """
+    TopoJSON (objeto `GEO_OBJECT`) dos municípios de `read_geojson`:
+    - cada anel vira um arco próprio, simplificado, quantizado e codificado em deltas;
+    - `ideb` guarda a contagem de pontos antes/depois, para o painel mostrar o ganho.
+    """
+    pontos = np.vstack([anel for m in municipios for parte in m["poligonos"] for anel in parte])
+    x0, y0 = pontos.min(axis=0)
+    x1, y1 = pontos.max(axis=0)
+    escala = np.array([(x1 - x0) / (quantizacao - 1) or 1.0, (y1 - y0) / (quantizacao - 1) or 1.0])
+    origem = np.array([x0, y0])
+
+    arcos, geometrias, n_saida = [], [], 0
+    for m in municipios:
+        partes = []
+        for parte in m["poligonos"]:
+            aneis = []
+            for anel in parte:
+                q = np.rint((simplify_ring(anel, tolerancia) - origem) / escala).astype(np.int64)
+                # pontos que caem na mesma célula da grade viram um só
+                q = q[np.r_[True, (np.diff(q, axis=0) != 0).any(axis=1)]]
+                n_saida += len(q)
+                aneis.append([len(arcos)])
+                arcos.append(np.vstack([q[:1], np.diff(q, axis=0)]).tolist())
+            partes.append(aneis)
+        tipo, arcos_geo = ("MultiPolygon", partes) if len(partes) > 1 else ("Polygon", partes[0])
+        geometrias.append({"type": tipo, "arcs": arcos_geo, "id": m["codigo"], "properties": {"nome": m["nome"]}})
+    return {
+        "type": "Topology",
+        "bbox": [float(x0), float(y0), float(x1), float(y1)],
+        "transform": {"scale": escala.tolist(), "translate": origem.tolist()},
+        "objects": {GEO_OBJECT: {"type": "GeometryCollection", "geometries": geometrias}},
+        "arcs": arcos,
+        "ideb": {"municipios": len(municipios), "pontos_originais": int(len(pontos)), "pontos": n_saida},
+    }
+
+def read_topology(path: str) -> dict:
+    """
+    TopoJSON já simplificado (objeto `GEO_OBJECT`, `id` = código do município); sem o bloco
+    `ideb` (arquivo de outra ferramenta), as contagens saem das próprias geometrias e arcos.
+    """
+    with open(path, encoding="utf-8") as f:
+        topologia = json.load(f)
+    if topologia.get("type") != "Topology" or GEO_OBJECT not in topologia.get("objects", {}):
+        raise ValueError(f"{path}: esperado um TopoJSON com o objeto '{GEO_OBJECT}'")
+    if "ideb" not in topologia:
+        pontos = sum(len(arco) for arco in topologia["arcs"])
+        n = len(topologia["objects"][GEO_OBJECT]["geometries"])
+        topologia["ideb"] = {"municipios": n, "pontos_originais": pontos, "pontos": pontos}
+    return topologia
+
+def write_topology(topologia: dict, destino: str) -> None:
+    """Grava o TopoJSON compacto (sem espaços, UTF-8)."""
+    with open(destino, "w", encoding="utf-8") as f:
+        json.dump(topologia, f, separators=(",", ":"), ensure_ascii=False)
+
+def simplified_topology(path: str, tolerancia: float = GEO_TOLERANCE, quantizacao: int = GEO_QUANTIZATION,
+                        cache_dir: str = CACHE_DIR) -> tuple[str, dict]:
+    """
+    (arquivo, topologia) da malha de `path`, passando pelo cache em disco:
+    `<cache_dir>/<nome>-<chave>.topo.json`, com a chave derivada da versão do arquivo e dos
+    parâmetros; versões antigas da mesma malha são apagadas ao gravar.
+    - GeoJSON: simplificado e quantizado (`build_topology`);
+    - TopoJSON (`.topo.json`/`.topojson`): já simplificado, só ganha o nome versionado
+      (o navegador não reaproveita uma malha antiga depois de o arquivo mudar).
+    """
+    chave = hashlib.sha1(repr((file_version(path), tolerancia, quantizacao, GEO_CACHE_VERSION))
+                         .encode()).hexdigest()[:12]
+    stem = _stem(path)
+    destino = os.path.join(cache_dir, f"{stem}-{chave}.topo.json")
+    if os.path.exists(destino):
+        with open(destino, encoding="utf-8") as f:
+            return destino, json.load(f)
+
+    if path.endswith(_TOPO_EXTS):
+        topologia = read_topology(path)
+    else:
+        topologia = build_topology(read_geojson(path), tolerancia, quantizacao)
+    os.makedirs(cache_dir, exist_ok=True)
+    for nome in os.listdir(cache_dir):
+        if nome.startswith(f"{stem}-") and nome.endswith(".topo.json"):
+            os.remove(os.path.join(cache_dir, nome))
+    write_topology(topologia, destino)
+    return destino, topologia
+
+def map_values(cube: pd.DataFrame, familia: str, ano: int, nome_codigo: dict) -> pd.DataFrame:
+    """
+    Valores de (família, ano) por município, prontos para o mapa: colunas "codigo" (6
+    dígitos, o `id` da malha), "Município" e "valor"; municípios sem código ficam de fora.
+    """
+    valores = cube_lookup(cube, familia, ano, list(nome_codigo))
+    codigos = pd.Series({nome: muni_code6(c) for nome, c in nome_codigo.items()}, dtype="Int64")
+    out = pd.DataFrame({
+        "codigo": codigos.reindex(valores.index).to_numpy(),
+        "Município": valores.index.astype(str),
+        "valor": valores.to_numpy(dtype=np.float64),
+    })
+    return out.dropna(subset=["codigo"]).astype({"codigo": "int64"}).reset_index(drop=True)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m ideb.geo",
+        description="Simplifica um GeoJSON de municípios (ex.: malha do IBGE) num TopoJSON para o painel.",
+    )
+    parser.add_argument("entrada", help="GeoJSON dos municípios")
+    parser.add_argument("saida", help="TopoJSON de saída (ex.: data/municipios_ES.topo.json)")
+    parser.add_argument("--tolerancia", type=float, default=GEO_TOLERANCE,
+                        help=f"tolerância do Douglas–Peucker, em graus (padrão: {GEO_TOLERANCE})")
+    parser.add_argument("--quantizacao", type=int, default=GEO_QUANTIZATION,
+                        help=f"pontos da grade em cada eixo (padrão: {GEO_QUANTIZATION})")
+    args = parser.parse_args(argv)
+
+    topologia = build_topology(read_geojson(args.entrada), args.tolerancia, args.quantizacao)
+    pasta = os.path.dirname(args.saida)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    write_topology(topologia, args.saida)
+    info = topologia["ideb"]
+    print(f"{info['municipios']} municípios, {info['pontos_originais']} -> {info['pontos']} pontos, "
+          f"{os.path.getsize(args.saida) / 1024:.0f} KB em '{args.saida}'.")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
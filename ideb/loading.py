@@ -0,0 +1,191 @@
+"""Leitura do xlsx, preparação da base e cache em disco (Feather/Arrow)."""
+import hashlib
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .catalog import list_sheets
+from .cleaning import ffill_text_cols, infer_numeric_types, normalize_rede
+from .escolas import is_school_file, read_school_aggregate
+from .perf import stage
+
+try:
+    import pyarrow.feather as feather
+    HAS_ARROW = True
+except Exception:
+    HAS_ARROW = False
+
+CACHE_DIR = os.environ.get("IDEB_CACHE_DIR", ".cache_ideb")
+# incremente quando o pipeline de preparação mudar: invalida os caches em disco
+PIPELINE_VERSION = 3
+
+def read_xlsx(path: str, sheet_name=0) -> pd.DataFrame:
+    return pd.read_excel(path, engine="openpyxl", sheet_name=sheet_name)
+
+def file_version(path: str) -> tuple[int, int]:
+    """Assinatura barata do arquivo (mtime em ns, tamanho) usada como chave de cache."""
+    info = os.stat(path)
+    return info.st_mtime_ns, info.st_size
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Hash do conteúdo do arquivo, lido em blocos."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _sidecar_prefix(path: str, sheet_name) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}.{sheet_name}."
+
+def _sidecar_path(path: str, sheet_name, digest: str, downcast: bool = True) -> str:
+    variante = "" if downcast else ".f64"
+    name = f"{_sidecar_prefix(path, sheet_name)}{digest[:16]}.v{PIPELINE_VERSION}{variante}.feather"
+    return os.path.join(CACHE_DIR, name)
+
+_SIDECAR_SUFIXO_RE = re.compile(r"[0-9a-f]{16}\.v\d+(\.f64)?\.feather")
+
+def read_sidecar(sidecar: str) -> pd.DataFrame | None:
+    """Lê o cache Feather via memory-map. Retorna None se não houver cache utilizável."""
+    if not HAS_ARROW or not os.path.exists(sidecar):
+        return None
+    try:
+        return feather.read_table(sidecar, memory_map=True).to_pandas()
+    except Exception:
+        return None
+
+def write_sidecar(df: pd.DataFrame, path: str, sheet_name, sidecar: str) -> None:
+    """
+    Grava o cache Feather (sem compressão, para permitir memory-map) e remove
+    versões antigas do mesmo arquivo/aba. Falhas de escrita não interrompem o app.
+    """
+    if not HAS_ARROW or not df.columns.is_unique:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = sidecar + ".tmp"
+        feather.write_feather(df, tmp, compression="uncompressed")
+        os.replace(tmp, sidecar)
+        prefix = _sidecar_prefix(path, sheet_name)
+        for name in os.listdir(CACHE_DIR):
+            old = os.path.join(CACHE_DIR, name)
+            # só versões desta aba (aba "A" não apaga o cache da aba "A.b")
+            if (name.startswith(prefix) and old != sidecar
+                    and _SIDECAR_SUFIXO_RE.fullmatch(name[len(prefix):])):
+                os.remove(old)
+    except Exception:
+        pass
+
+def prepare_dataset(df: pd.DataFrame, downcast: bool = True) -> pd.DataFrame:
+    """
+    Pipeline único de preparação da planilha IDEB:
+    - remove espaços dos cabeçalhos;
+    - tipa colunas numéricas (`infer_numeric_types`; as convertidas ficam em `df.attrs`);
+    - preenche textos agrupados (`ffill_text_cols`);
+    - normaliza REDE e mantém apenas a rede 'Estadual';
+    - `downcast`: reduz os tipos (`downcast_frame`).
+    """
+    df = df.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+    with stage("tipagem numérica"):
+        df, convertidas = infer_numeric_types(df)
+    with stage("ffill de textos"):
+        df = ffill_text_cols(df)
+
+    if "REDE" in df.columns:
+        df["REDE"] = df["REDE"].map(normalize_rede)
+        df = df[df["REDE"] == "Estadual"]
+    df = df.reset_index(drop=True)
+    if downcast:
+        with stage("downcast"):
+            df = downcast_frame(df)
+    df.attrs["colunas_convertidas"] = convertidas
+    return df
+
+# textos muito repetidos: viram category
+CATEGORY_COLS = ["NO_MUNICIPIO", "REDE", "SG_UF"]
+
+def downcast_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduz o tamanho da base em memória (e de cada entrada de cache):
+    - float64 -> float32; inteiros -> menor tipo inteiro que comporta os valores;
+    - NO_MUNICIPIO, REDE e SG_UF -> category.
+    """
+    out = df.copy(deep=False)
+    for pos in range(out.shape[1]):
+        s = out.iloc[:, pos]
+        if s.dtype == "float64":
+            out.isetitem(pos, s.astype("float32"))
+        elif pd.api.types.is_integer_dtype(s) and s.dtype.kind in "iu":
+            out.isetitem(pos, pd.to_numeric(s, downcast="integer"))
+        elif out.columns[pos] in CATEGORY_COLS:
+            out.isetitem(pos, s.astype("category"))
+    return out
+
+def load_prepared(path: str, sheet_name=0, downcast: bool = True) -> pd.DataFrame:
+    """
+    Base preparada a partir do xlsx, passando pelo cache em disco: o cache é
+    indexado pelo hash do conteúdo, então sobrevive a reinícios do processo e é
+    invalidado sozinho quando o xlsx muda. Arquivos por escola (xlsx/csv, ver
+    `ideb.escolas`) são agregados por município antes da preparação.
+    """
+    with stage("hash do xlsx"):
+        sidecar = _sidecar_path(path, sheet_name, file_sha256(path), downcast)
+    with stage("leitura do cache em disco"):
+        df = read_sidecar(sidecar)
+    if df is None:
+        if is_school_file(path):
+            # arquivo por escola: lido em blocos e já agregado por município
+            with stage("agregação das escolas (em blocos)"):
+                raw = read_school_aggregate(path, sheet_name)
+        else:
+            with stage("leitura do xlsx"):
+                raw = read_xlsx(path, sheet_name=sheet_name)
+        with stage("preparação"):
+            df = prepare_dataset(raw, downcast=downcast)
+        with stage("gravação do cache em disco"):
+            write_sidecar(df, path, sheet_name, sidecar)
+    return df
+
+# abaixo disso o custo de subir processos (~1 s com pandas) supera o ganho do paralelismo
+PARALLEL_MIN_BYTES = 2 * 2**20
+
+def load_workbook_sheets(path: str, sheets=None, downcast: bool = True,
+                         workers: int | None = None) -> dict:
+    """
+    Todas as abas do xlsx (ou só `sheets`) preparadas pelo mesmo pipeline de `load_prepared`:
+    - abas com cache em disco válido são lidas direto (memory-map);
+    - as demais são parseadas em paralelo, uma por processo (o parse do openpyxl é
+      CPU-bound e preso ao GIL), então o tempo acompanha a maior aba, não a soma;
+    - `workers=None`: um processo por núcleo, e nenhum para arquivos < PARALLEL_MIN_BYTES.
+    Retorna {aba: DataFrame} na ordem das abas.
+    """
+    sheets = list_sheets(path) if sheets is None else list(sheets)
+    digest = file_sha256(path)
+    out, pendentes = {}, []
+    for sheet in sheets:
+        df = read_sidecar(_sidecar_path(path, sheet, digest, downcast))
+        if df is None:
+            pendentes.append(sheet)
+        else:
+            out[sheet] = df
+
+    if workers is None and os.path.getsize(path) < PARALLEL_MIN_BYTES:
+        workers = 1
+    workers = min(workers or os.cpu_count() or 1, len(pendentes))
+    if workers <= 1:
+        for sheet in pendentes:
+            out[sheet] = load_prepared(path, sheet, downcast)
+    else:
+        # spawn: seguro mesmo dentro de servidores com threads (ex.: Streamlit)
+        ctx = multiprocessing.get_context("spawn")
+        with stage(f"abas em paralelo ({len(pendentes)} abas, {workers} processos)"):
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as ex:
+                futuros = {sheet: ex.submit(load_prepared, path, sheet, downcast) for sheet in pendentes}
+                for sheet, futuro in futuros.items():
+                    out[sheet] = futuro.result()
+    return {sheet: out[sheet] for sheet in sheets}
@@ -0,0 +1,78 @@
+"""Índice de municípios: busca sem acento, por trecho/prefixo e aproximada."""
+import difflib
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from .cleaning import get_muni_label_col
+
+def normalize_text(texto) -> str:
+    """Forma de busca: sem acentos (NFKD) e sem caixa (casefold). 'Vitória' -> 'vitoria'."""
+    t = unicodedata.normalize("NFKD", str(texto))
+    return "".join(ch for ch in t if not unicodedata.combining(ch)).casefold()
+
+def build_municipio_index(df: pd.DataFrame) -> dict:
+    """
+    Índice único de municípios da base (montado uma vez por versão do arquivo):
+    - "opcoes": nomes distintos ordenados (para os multiselects);
+    - "chaves": formas normalizadas distintas; "chave_linha": id da chave de cada linha;
+    - "sufixos"/"sufixo_chave": todos os sufixos das chaves, ordenados — com `bisect`,
+      achar quem CONTÉM um trecho vira busca de prefixo em array ordenado;
+    - "codigo_nome"/"nome_codigo": mapeamento código <-> nome (se houver coluna de código).
+    """
+    code_col, label_col = get_muni_label_col(df)
+    rotulos = df[label_col]
+    validos = rotulos.notna().to_numpy()
+    nomes = rotulos.astype(str).to_numpy()
+
+    norm_linha = [normalize_text(n) for n in nomes]
+    chaves = sorted(set(norm_linha))
+    chave_id = {c: i for i, c in enumerate(chaves)}
+    chave_linha = np.array([chave_id[c] if ok else -1 for c, ok in zip(norm_linha, validos)])
+
+    pares = sorted((c[i:], k) for k, c in enumerate(chaves) for i in range(len(c)))
+    idx = {
+        "label_col": label_col,
+        "code_col": code_col,
+        "opcoes": sorted(set(nomes[validos])),
+        "chaves": chaves,
+        "chave_linha": chave_linha,
+        "sufixos": [p[0] for p in pares],
+        "sufixo_chave": np.array([p[1] for p in pares], dtype=np.int64),
+        "codigo_nome": {},
+        "nome_codigo": {},
+    }
+    if code_col is not None and code_col != label_col:
+        pares_cn = df.loc[validos, [code_col, label_col]].dropna().drop_duplicates(code_col)
+        idx["codigo_nome"] = dict(zip(pares_cn[code_col].tolist(), pares_cn[label_col].astype(str)))
+        idx["nome_codigo"] = {n: c for c, n in idx["codigo_nome"].items()}
+    return idx
+
+def _key_range(ordenado: list[str], termo: str) -> tuple[int, int]:
+    """Faixa [ini, fim) de `ordenado` cujos itens começam com `termo` (busca binária)."""
+    return bisect_left(ordenado, termo), bisect_left(ordenado, termo + "\uffff")
+
+def search_municipios(idx: dict, termo: str, modo: str = "trecho", aproximada: bool = False) -> list[int]:
+    """
+    Ids das chaves (nomes normalizados) que casam com `termo`.
+    - modo "trecho": nome contém o termo; modo "prefixo": nome começa com o termo;
+    - `aproximada`: se nada casar, tenta nomes parecidos (erros de digitação) via difflib.
+    """
+    t = normalize_text(termo.strip())
+    if modo == "prefixo":
+        ini, fim = _key_range(idx["chaves"], t)
+        ids = list(range(ini, fim))
+    else:
+        ini, fim = _key_range(idx["sufixos"], t)
+        ids = sorted(set(idx["sufixo_chave"][ini:fim].tolist()))
+    if not ids and aproximada and t:
+        parecidos = difflib.get_close_matches(t, idx["chaves"], n=5, cutoff=0.75)
+        ids = sorted(idx["chaves"].index(c) for c in parecidos)
+    return ids
+
+def municipio_mask(idx: dict, termo: str, modo: str = "trecho", aproximada: bool = False) -> np.ndarray:
+    """Máscara booleana das LINHAS da base cujo município casa com `termo`."""
+    ids = search_municipios(idx, termo, modo=modo, aproximada=aproximada)
+    return np.isin(idx["chave_linha"], ids)
@@ -0,0 +1,142 @@
+"""
+Instrumentação opcional: tempo por etapa de cada execução, acertos/erros de cache,
+linhas de log estruturadas (JSON) e métricas no formato texto do Prometheus.
+
+As etapas são registradas na execução "atual" (ContextVar), então funções do
+núcleo podem marcar etapas sem receber parâmetros extras; sem execução ativa,
+`stage()` não faz nada.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_ATUAL: ContextVar[dict | None] = ContextVar("ideb_perf_run", default=None)
+
+# acumulado do processo, exposto em /metrics
+_REGISTRO = {"lock": threading.Lock(), "etapas": {}, "execucoes": {}, "cache": {}}
+
+logger = logging.getLogger("ideb.perf")
+
+def enable_logging(level: int = logging.INFO) -> None:
+    """Garante que as linhas de `ideb.perf` cheguem ao stderr (idempotente)."""
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+def start_run(rotulo: str) -> dict:
+    """Abre a execução atual (ex.: um rerun da seção `rotulo`)."""
+    run = {"rotulo": rotulo, "inicio": time.perf_counter(), "nivel": 0,
+           "etapas": [], "cache": {}, "total_s": None}
+    _ATUAL.set(run)
+    return run
+
+@contextmanager
+def stage(nome: str):
+    """Cronometra o bloco como uma etapa da execução atual (aninhamento vira indentação)."""
+    run = _ATUAL.get()
+    if run is None:
+        yield
+        return
+    item = {"etapa": nome, "nivel": run["nivel"], "s": 0.0}
+    run["etapas"].append(item)
+    run["nivel"] += 1
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        item["s"] = time.perf_counter() - t0
+        run["nivel"] -= 1
+
+def count_cache(nome: str, miss: bool) -> None:
+    """Conta uma chamada (miss=False) ou um miss (miss=True) do cache `nome` na execução atual."""
+    run = _ATUAL.get()
+    if run is None:
+        return
+    c = run["cache"].setdefault(nome, {"chamadas": 0, "misses": 0})
+    c["misses" if miss else "chamadas"] += 1
+
+def finish_run(run: dict) -> dict:
+    """Fecha a execução: soma no acumulado do processo e emite uma linha de log JSON."""
+    run["total_s"] = time.perf_counter() - run["inicio"]
+    with _REGISTRO["lock"]:
+        e = _REGISTRO["execucoes"].setdefault(run["rotulo"], [0.0, 0])
+        e[0] += run["total_s"]
+        e[1] += 1
+        for item in run["etapas"]:
+            acc = _REGISTRO["etapas"].setdefault(item["etapa"], [0.0, 0])
+            acc[0] += item["s"]
+            acc[1] += 1
+        for nome, c in run["cache"].items():
+            acc = _REGISTRO["cache"].setdefault(nome, {"hit": 0, "miss": 0})
+            acc["miss"] += c["misses"]
+            acc["hit"] += max(c["chamadas"] - c["misses"], 0)
+    logger.info(json.dumps({
+        "evento": "rerun",
+        "secao": run["rotulo"],
+        "total_ms": round(run["total_s"] * 1000, 2),
+        "etapas": [{"etapa": i["etapa"], "nivel": i["nivel"], "ms": round(i["s"] * 1000, 2)}
+                   for i in run["etapas"]],
+        "cache": run["cache"],
+    }, ensure_ascii=False))
+    _ATUAL.set(None)
+    return run
+
+def _label(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def render_prometheus() -> str:
+    """Acumulado do processo no formato texto de exposição do Prometheus."""
+    with _REGISTRO["lock"]:
+        etapas = dict(_REGISTRO["etapas"])
+        execucoes = dict(_REGISTRO["execucoes"])
+        cache = {k: dict(v) for k, v in _REGISTRO["cache"].items()}
+    linhas = [
+        "# HELP ideb_rerun_seconds Tempo total das execuções do script, por seção.",
+        "# TYPE ideb_rerun_seconds summary",
+    ]
+    for secao, (soma, n) in sorted(execucoes.items()):
+        linhas.append(f'ideb_rerun_seconds_sum{{section="{_label(secao)}"}} {soma:.6f}')
+        linhas.append(f'ideb_rerun_seconds_count{{section="{_label(secao)}"}} {n}')
+    linhas += [
+        "# HELP ideb_stage_seconds Tempo gasto em cada etapa instrumentada.",
+        "# TYPE ideb_stage_seconds summary",
+    ]
+    for etapa, (soma, n) in sorted(etapas.items()):
+        linhas.append(f'ideb_stage_seconds_sum{{stage="{_label(etapa)}"}} {soma:.6f}')
+        linhas.append(f'ideb_stage_seconds_count{{stage="{_label(etapa)}"}} {n}')
+    linhas += [
+        "# HELP ideb_cache_requests_total Chamadas aos caches do app, por resultado.",
+        "# TYPE ideb_cache_requests_total counter",
+    ]
+    for nome, c in sorted(cache.items()):
+        for resultado in ("hit", "miss"):
+            linhas.append(f'ideb_cache_requests_total{{cache="{_label(nome)}",result="{resultado}"}} {c[resultado]}')
+    return "\n".join(linhas) + "\n"
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        corpo = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Sobe `GET /metrics` numa thread daemon (por padrão só em localhost)."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="ideb-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,49 @@
+"""Ranking pré-ordenado de municípios (todas as métricas, nas duas direções)."""
+import numpy as np
+import pandas as pd
+
+def build_ranking_index(df: pd.DataFrame, label_col: str, extra: pd.DataFrame | None = None) -> dict:
+    """
+    Pré-ordena TODAS as métricas numéricas uma única vez:
+    - "ordens": {métrica: {"desc": posições, "asc": posições}} — só linhas com nome e valor
+      (ordenação estável, como o `mergesort` anterior: empates mantêm a ordem da base);
+    - "valores": {métrica: array de valores}; "rotulos": nomes para exibição.
+    Nomes de coluna duplicados: vale a primeira ocorrência. O filtro por nome fica no
+    índice de municípios (`municipio_mask`).
+    `extra`: métricas calculadas fora da base (ex.: `build_trajectory`), uma linha por linha
+    de `df` na mesma ordem; entram depois das colunas da base.
+    """
+    rotulos = df[label_col].astype(str).to_numpy()
+    tem_nome = df[label_col].notna().to_numpy()
+    ordens, valores = {}, {}
+    colunas = [(df, pos) for pos in range(df.shape[1])]
+    if extra is not None:
+        colunas += [(extra, pos) for pos in range(extra.shape[1])]
+    for tab, pos in colunas:
+        name, s = tab.columns[pos], tab.iloc[:, pos]
+        if name in ordens or not pd.api.types.is_numeric_dtype(s):
+            continue
+        v = s.to_numpy(dtype=float)
+        validos = np.flatnonzero(tem_nome & ~np.isnan(v))
+        ordens[name] = {
+            "asc": validos[np.argsort(v[validos], kind="stable")],
+            "desc": validos[np.argsort(-v[validos], kind="stable")],
+        }
+        valores[name] = s.to_numpy()
+    return {"ordens": ordens, "valores": valores, "rotulos": rotulos}
+
+def rank_municipios(index: dict, metrica: str, ascending: bool = False,
+                    mask: np.ndarray | None = None, topn: int | None = None) -> pd.DataFrame:
+    """
+    Ranking por fatiamento da ordem pré-calculada (sem reordenar a cada chamada).
+    `mask` (linhas permitidas, ex.: `municipio_mask`) é aplicada ANTES de contar a posição.
+    """
+    ordem = index["ordens"][metrica]["asc" if ascending else "desc"]
+    if mask is not None:
+        ordem = ordem[mask[ordem]]
+    top = ordem[:topn]
+    return pd.DataFrame({
+        "Posição": np.arange(1, len(top) + 1),
+        "Município": index["rotulos"][top],
+        metrica: index["valores"][metrica][top],
+    })
@@ -0,0 +1,78 @@
+"""Tabela longa (município x família x ano x subperíodo) e cubo agregado."""
+import numpy as np
+import pandas as pd
+
+from .cleaning import _coerce_block
+
+LONG_COLS = ["linha", "Município", "família", "ano", "subperíodo", "valor"]
+
+def build_long_table(df: pd.DataFrame, index: dict, label_col: str) -> pd.DataFrame:
+    """
+    Derrete todas as colunas com ano, de todas as famílias, numa única passada vetorizada.
+    - Uma linha por (linha da base, coluna com ano); células sem número são descartadas.
+    - `linha` guarda a posição da linha na base, para médias por linha quando preciso.
+    - `subperíodo` é o sufixo após o ano (ex.: '1'..'4', 'SI_4') ou None.
+    """
+    positions = sorted(index["colunas"])
+    if not positions:
+        return pd.DataFrame(columns=LONG_COLS)
+
+    block = df.iloc[:, positions]
+    block = _coerce_block(block, list(block.columns))
+    # mantém float32 se a base foi reduzida (evita ruído ao voltar para float64)
+    dtype = np.float32 if all(dt == np.float32 for dt in block.dtypes) else np.float64
+    valores = block.to_numpy(dtype=dtype).ravel(order="F")  # coluna a coluna
+
+    n_rows = len(df)
+    meta = [index["colunas"][pos] for pos in positions]
+    labels = df[label_col].astype(str).to_numpy()
+
+    long_df = pd.DataFrame({
+        "linha": np.tile(np.arange(n_rows), len(positions)),
+        "Município": pd.Categorical(np.tile(labels, len(positions))),
+        "família": pd.Categorical(np.repeat([m[0] for m in meta], n_rows)),
+        "ano": np.repeat(np.array([m[1] for m in meta], dtype=np.int16), n_rows),
+        "subperíodo": np.repeat(np.array([m[2] for m in meta], dtype=object), n_rows),
+        "valor": valores,
+    })
+    return long_df[~np.isnan(valores)].reset_index(drop=True)
+
+def family_timeseries(long_df: pd.DataFrame, familia: str, municipios) -> pd.DataFrame:
+    """Série anual (média dos subperíodos) de uma família para os municípios escolhidos."""
+    sel = long_df[(long_df["família"] == familia) & long_df["Município"].isin(municipios)]
+    return (
+        sel
+        .groupby(["Município", "ano"], as_index=False, sort=True, observed=True)["valor"]
+        .mean()
+        .astype({"Município": str})
+        .sort_values(["ano", "Município"])
+        .reset_index(drop=True)
+    )
+
+def build_cube(long_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pré-agrega a tabela longa por (família, ano, Município), ordenada para fatiamento:
+    - "valor": média dos subperíodos em cada linha da base, depois média entre as
+      linhas do mesmo município (mesma regra das abas do Comparador);
+    - "n": quantidade de valores (subperíodos) que entraram na média.
+    """
+    por_linha = (
+        long_df
+        .groupby(["família", "ano", "linha", "Município"], observed=True, sort=False)["valor"]
+        .agg(["mean", "count"])
+        .reset_index()
+        .astype({"família": str, "Município": str})
+    )
+    return (
+        por_linha
+        .groupby(["família", "ano", "Município"], sort=True)
+        .agg(valor=("mean", "mean"), n=("count", "sum"))
+    )
+
+def cube_lookup(cube: pd.DataFrame, familia: str, ano: int, municipios) -> pd.Series:
+    """Valores de (família, ano) para os municípios pedidos: fatia ordenada + reindex."""
+    try:
+        fatia = cube.loc[(familia, ano)]
+    except KeyError:
+        return pd.Series(dtype="float64", name="valor")
+    return fatia["valor"].reindex(municipios).dropna()
@@ -0,0 +1,42 @@
+"""Índice de famílias de métricas x ano a partir dos cabeçalhos da planilha."""
+import re
+
+_ANO_RE = re.compile(r"20\d{2}")
+
+def parse_metric_col(col: str) -> tuple[str, int, str | None] | None:
+    """
+    Decompõe o nome de uma coluna com ano em (família, ano, subperíodo).
+    Ex.: 'VL_APROVACAO_2017_1' -> ('VL_APROVACAO', 2017, '1');
+         'VL_NOTA_MEDIA_2019'  -> ('VL_NOTA_MEDIA', 2019, None).
+    Retorna None se a coluna não tiver ano (padrão 20XX).
+    """
+    m = _ANO_RE.search(col)
+    if m is None:
+        return None
+    sub = col[m.end():].lstrip("_") or None
+    return col[:m.start()].rstrip("_"), int(m.group()), sub
+
+def build_schema_index(columns) -> dict:
+    """
+    Varre os cabeçalhos uma única vez e monta:
+    - "familias": {família: {ano: [posições das colunas]}} — posições, pois há nomes duplicados;
+    - "colunas":  {posição: (família, ano, subperíodo)} — subperíodo é o sufixo após o ano
+      (ex.: '1'..'4' em 2017_1..2017_4), ou None quando a coluna é anual.
+    """
+    familias: dict[str, dict[int, list[int]]] = {}
+    colunas: dict[int, tuple[str, int, str | None]] = {}
+    for pos, col in enumerate(columns):
+        parsed = parse_metric_col(str(col))
+        if parsed is None:
+            continue
+        fam, ano, _ = parsed
+        familias.setdefault(fam, {}).setdefault(ano, []).append(pos)
+        colunas[pos] = parsed
+    return {"familias": familias, "colunas": colunas}
+
+def family_positions(index: dict, familia: str, ano: int | None = None) -> list[int]:
+    """Posições das colunas de uma família (todas as edições, ou só a do `ano`)."""
+    anos = index["familias"][familia]
+    if ano is not None:
+        return list(anos[ano])
+    return [pos for a in sorted(anos) for pos in anos[a]]
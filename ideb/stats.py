@@ -0,0 +1,167 @@
+"""
+Correlações e regressões entre todas as métricas (família, ano), entre municípios.
+
+Tudo sai de poucos produtos de matrizes sobre o cubo em formato largo
+(municípios x métricas): com V = máscara de valores presentes e X0 = valores
+com NaN -> 0, somas como X0.T @ V dão, para cada par (i, j), a soma de i nas
+linhas em que j também existe. Assim cada par usa só os municípios com os dois
+valores (máscara par a par), sem laço por par. O Spearman refaz os postos dentro
+dessa máscara, agrupando os pares pelo padrão de ausência dos dois lados.
+"""
+import numpy as np
+import pandas as pd
+
+# pares com menos municípios em comum ficam de fora
+MIN_MUNICIPIOS = 5
+
+STATS_COLS = ["X família", "X ano", "Y família", "Y ano", "n",
+              "pearson", "spearman", "inclinação", "intercepto", "r²"]
+
+def cube_matrix(cube: pd.DataFrame) -> pd.DataFrame:
+    """Cubo -> tabela larga: linhas = municípios, colunas = (família, ano)."""
+    return cube["valor"].unstack(["família", "ano"]).sort_index(axis=1).astype("float64")
+
+def _ranks_without(postos: np.ndarray, fora: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """
+    Postos médios das colunas `cols` sem as linhas `fora` (demais linhas na ordem original):
+    cada linha removida com posto menor tira 1 do posto, e com posto igual (empate) tira 1/2.
+    Postos médios são múltiplos de 1/2, então as contagens saem de um histograma acumulado
+    de 2·posto por coluna (um `bincount` para todas as colunas).
+    """
+    p = postos[:, cols]
+    if len(fora) == 0:
+        return p
+    n2 = 2 * len(postos) + 2
+    dobro = np.nan_to_num(2 * p, nan=0).astype(np.int64)       # NaN -> 0 (fora da contagem)
+    removidos = dobro[fora] + np.arange(len(cols)) * n2
+    hist = np.bincount(removidos[dobro[fora] > 0], minlength=n2 * len(cols)).reshape(len(cols), n2).T
+    acum = np.cumsum(hist, axis=0)
+    menores = np.take_along_axis(acum, np.maximum(dobro - 1, 0), axis=0)
+    iguais = np.take_along_axis(hist, dobro, axis=0)
+    out = p - menores - 0.5 * iguais
+    out[fora] = np.nan
+    return out
+
+def _spearman_pairs(m: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    Spearman exato de cada par (i[k], j[k]), com os postos refeitos só nos municípios
+    que os dois lados têm. Pares em que nenhum lado perde linhas na máscara do outro
+    saem direto dos postos por coluna (produtos de matrizes); os demais, um passo por
+    coluna i, vetorizado em todos os j dela:
+    - postos de x_j: os postos da coluna inteira, descontadas as linhas em que i falta;
+    - postos de x_i: com as linhas ordenadas por x_i, a soma acumulada da máscara de
+      cada j conta quantos valores menores (e empatados) o j também tem.
+    """
+    v = ~np.isnan(m)
+    postos = pd.DataFrame(m).rank(method="average").to_numpy()
+    n_par, _, _, cov, varx, vary = _pairwise_moments(postos)
+    rho = _pearson(cov, varx, vary)[i, j]
+    presentes = v.sum(axis=0)
+    refazer = (n_par[i, j] < presentes[i]) | (n_par[i, j] < presentes[j])
+    for col in np.unique(i[refazer]):
+        k = np.flatnonzero(refazer & (i == col))
+        linhas = np.flatnonzero(v[:, col])
+        ordem = linhas[np.argsort(m[linhas, col], kind="stable")]
+        xs = m[ordem, col]
+        mask = v[np.ix_(ordem, j[k])].astype(np.float64)
+
+        # postos médios de x_i dentro da máscara de cada j (empates = mesmo grupo)
+        grupo = np.cumsum(np.r_[True, xs[1:] != xs[:-1]]) - 1
+        inicio = np.flatnonzero(np.r_[True, xs[1:] != xs[:-1]])
+        fim = np.r_[inicio[1:], len(xs)]
+        acum = np.vstack([np.zeros((1, len(k))), np.cumsum(mask, axis=0)])
+        menores, ate = acum[inicio[grupo]], acum[fim[grupo]]
+        a = np.where(mask > 0, menores + (ate - menores + 1) / 2, 0.0)
+        b = np.nan_to_num(_ranks_without(postos, np.flatnonzero(~v[:, col]), j[k])[ordem], nan=0.0)
+
+        n = mask.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            media = (n + 1) / 2
+            cov = (a * b).sum(axis=0) - n * media * media
+            va = (a * a).sum(axis=0) - n * media * media
+            vb = (b * b).sum(axis=0) - n * media * media
+            rho[k] = np.where(n >= 2, cov / np.sqrt(va * vb), np.nan)
+    return np.clip(rho, -1.0, 1.0)
+
+def _pairwise_moments(m: np.ndarray):
+    v = (~np.isnan(m)).astype(np.float64)
+    x0 = np.nan_to_num(m, nan=0.0)
+    n = v.T @ v                      # municípios em comum
+    sx = x0.T @ v                    # soma de i onde j existe
+    sy = sx.T                        # soma de j onde i existe
+    sxx = (x0 * x0).T @ v
+    syy = sxx.T
+    sxy = x0.T @ x0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sy / n
+        varx = sxx - sx * sx / n
+        vary = syy - sy * sy / n
+    return n, sx, sy, cov, varx, vary
+
+def _pearson(cov, varx, vary) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = cov / np.sqrt(varx * vary)
+    return np.clip(r, -1.0, 1.0)
+
+def correlation_matrix(wide: pd.DataFrame, method: str = "pearson") -> pd.DataFrame:
+    """Matriz de correlação par a par (pearson ou spearman, ambos exatos) das colunas de `wide`."""
+    m = wide.to_numpy(dtype=np.float64)
+    if method == "spearman":
+        i, j = np.triu_indices(m.shape[1], k=1)
+        r = np.eye(m.shape[1])
+        r[i, j] = r[j, i] = _spearman_pairs(m, i, j)
+        r[np.diag_indices_from(r)] = np.where((~np.isnan(m)).sum(axis=0) >= 2, 1.0, np.nan)
+    else:
+        _, _, _, cov, varx, vary = _pairwise_moments(m)
+        r = _pearson(cov, varx, vary)
+    return pd.DataFrame(r, index=wide.columns, columns=wide.columns)
+
+def pairwise_stats(wide: pd.DataFrame, min_n: int = MIN_MUNICIPIOS) -> pd.DataFrame:
+    """
+    Uma linha por par de métricas (X antes de Y, sem repetição) com pelo menos `min_n`
+    municípios em comum:
+    - pearson e spearman, ambos só nos municípios que o par tem em comum (os postos do
+      spearman são refeitos dentro da máscara do par);
+    - reta de mínimos quadrados Y = inclinação·X + intercepto e r².
+    """
+    m = wide.to_numpy(dtype=np.float64)
+    n, sx, sy, cov, varx, vary = _pairwise_moments(m)
+    r = _pearson(cov, varx, vary)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        inclinacao = cov / varx
+        intercepto = (sy - inclinacao * sx) / n
+
+    i, j = np.triu_indices(m.shape[1], k=1)
+    ok = (n[i, j] >= min_n) & np.isfinite(r[i, j])
+    i, j = i[ok], j[ok]
+    rho = _spearman_pairs(m, i, j)
+    cols = list(wide.columns)
+    return pd.DataFrame({
+        "X família": [cols[k][0] for k in i],
+        "X ano": [cols[k][1] for k in i],
+        "Y família": [cols[k][0] for k in j],
+        "Y ano": [cols[k][1] for k in j],
+        "n": n[i, j].astype(int),
+        "pearson": r[i, j],
+        "spearman": rho,
+        "inclinação": inclinacao[i, j],
+        "intercepto": intercepto[i, j],
+        "r²": r[i, j] ** 2,
+    }, columns=STATS_COLS)
+
+def ols_fit(x, y) -> dict | None:
+    """Reta Y = inclinação·X + intercepto (com r e n) nos pares sem NaN; None se < 2 pontos."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    ok = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[ok], y[ok]
+    if len(x) < 2 or np.ptp(x) == 0:
+        return None
+    dx, dy = x - x.mean(), y - y.mean()
+    inclinacao = (dx @ dy) / (dx @ dx)
+    denom = np.sqrt((dx @ dx) * (dy @ dy))
+    return {
+        "inclinação": float(inclinacao),
+        "intercepto": float(y.mean() - inclinacao * x.mean()),
+        "r": float((dx @ dy) / denom) if denom else float("nan"),
+        "n": int(len(x)),
+    }
@@ -0,0 +1,83 @@
+"""
+Trajetória de cada município: variação entre edições, crescimento anual composto
+(CAGR) e distância às metas do INEP, para todas as famílias de uma vez.
+
+Parte da tabela longa: uma matriz (linhas da base x (família, ano)) com a média
+anual dos subperíodos, e as métricas saem de operações sobre colunas inteiras
+(vizinhas, primeira/última de cada família, pares observado/projeção), sem laço
+por município. O resultado tem uma linha por linha da base, na mesma ordem, e
+entra no índice de ranking como qualquer outra métrica.
+"""
+import numpy as np
+import pandas as pd
+
+# prefixo do nome da métrica -> descrição (usado para agrupar as opções na tela)
+TRAJECTORY_KINDS = {
+    "Δ": "Variação entre edições (Δ)",
+    "CAGR%": "Crescimento anual composto (CAGR, %/ano)",
+    "Meta": "Distância à meta (observado − projeção do INEP)",
+}
+# família observada -> família das metas: VL_OBSERVADO_<ano> x VL_PROJECAO_<ano>
+_OBSERVADO, _PROJECAO = "OBSERVADO", "PROJECAO"
+
+def annual_matrix(long_df: pd.DataFrame, n_rows: int) -> pd.DataFrame:
+    """Linhas da base (0..n_rows-1) x (família, ano): média dos subperíodos do ano; NaN onde falta."""
+    anual = (
+        long_df
+        .groupby([long_df["linha"].to_numpy(), long_df["família"].astype(str).to_numpy(),
+                  long_df["ano"].to_numpy()], sort=True)["valor"]
+        .mean()
+    )
+    wide = anual.unstack([1, 2]).sort_index(axis=1)
+    wide.columns = wide.columns.set_names(["família", "ano"])
+    return wide.reindex(pd.RangeIndex(n_rows)).astype("float64")
+
+def build_trajectory(long_df: pd.DataFrame, n_rows: int) -> pd.DataFrame:
+    """
+    Métricas de trajetória de todas as famílias, uma linha por linha da base:
+    - "Δ <família> <a>→<b>": variação entre edições consecutivas da base;
+    - "CAGR% <família> <a>→<b>": crescimento anual composto da primeira à última edição,
+      em %/ano (só com os dois valores positivos);
+    - "Meta <família> − <projeção> <ano>": observado menos a meta projetada pelo INEP, nos
+      anos em que a base tem as duas colunas (positivo = acima da meta).
+    """
+    wide = annual_matrix(long_df, n_rows)
+    if wide.shape[1] == 0:
+        return pd.DataFrame(index=pd.RangeIndex(n_rows))
+    v = wide.to_numpy()
+    fam = wide.columns.get_level_values("família").to_numpy(dtype=object)
+    ano = wide.columns.get_level_values("ano").to_numpy(dtype=np.int64)
+    blocos, nomes = [], []
+
+    # colunas ordenadas por (família, ano): vizinhas da mesma família = edições consecutivas
+    mesma = fam[1:] == fam[:-1]
+    blocos.append(v[:, 1:][:, mesma] - v[:, :-1][:, mesma])
+    nomes += [f"Δ {f} {a}→{b}" for f, a, b in zip(fam[1:][mesma], ano[:-1][mesma], ano[1:][mesma])]
+
+    # primeira e última edição de cada família
+    inicio = np.flatnonzero(np.r_[True, ~mesma])
+    fim = np.r_[inicio[1:] - 1, len(fam) - 1]
+    ok = fim > inicio
+    i, j = inicio[ok], fim[ok]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cagr = ((v[:, j] / v[:, i]) ** (1.0 / (ano[j] - ano[i])) - 1.0) * 100.0
+    blocos.append(np.where((v[:, i] > 0) & (v[:, j] > 0), cagr, np.nan))
+    nomes += [f"CAGR% {fam[a]} {ano[a]}→{ano[b]}" for a, b in zip(i, j)]
+
+    # observado x projeção do mesmo ano
+    posicao = {(f, a): k for k, (f, a) in enumerate(zip(fam, ano))}
+    obs, proj = [], []
+    for k, (f, a) in enumerate(zip(fam, ano)):
+        p = posicao.get((f.replace(_OBSERVADO, _PROJECAO), a)) if _OBSERVADO in f else None
+        if p is not None:
+            obs.append(k)
+            proj.append(p)
+            nomes.append(f"Meta {f} − {fam[p]} {a}")
+    blocos.append(v[:, obs] - v[:, proj])
+
+    return pd.DataFrame(np.hstack(blocos), columns=nomes)
+
+def trajectory_kind(metrica: str) -> str | None:
+    """Prefixo de `TRAJECTORY_KINDS` da métrica, ou None para as colunas da base."""
+    prefixo = str(metrica).split(" ", 1)[0]
+    return prefixo if prefixo in TRAJECTORY_KINDS and " " in str(metrica) else None
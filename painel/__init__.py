@@ -0,0 +1,8 @@
+"""
+Páginas do painel (Streamlit), uma por arquivo, registradas com `st.navigation` no
+`streamlit_app.py`: cada rerun executa só a página aberta.
+
+Cada página define `render()` (e a chama quando executada como página); `dados`
+reúne os caches e componentes comuns, importado na primeira página com dados e
+mantido em `sys.modules` nos reruns seguintes. A página Início não importa pandas/NumPy.
+"""
@@ -0,0 +1,63 @@
+"""Seção Anomalias: valores suspeitos de todas as famílias (z robusto, IQR, saltos), filtro e relatório."""
+import streamlit as st
+
+from ideb.anomalies import ANOMALY_KINDS, IQR_K, MIN_N, Z_LIMITE
+from painel.dados import download_buttons, load_anomalies, load_dataset, select_dataset, show_table, view_frame
+
+def render() -> None:
+    ds = select_dataset()
+    st.header(f"🚨 Anomalias — {ds['titulo']}")
+
+    try:
+        load_dataset(ds["caminho"], ds["aba"])
+    except Exception as e:
+        st.error(f"Não foi possível abrir o Excel: {e}")
+        st.stop()
+
+    # relatório completo: uma passada sobre o cubo, uma vez por versão da base
+    report = load_anomalies(ds["caminho"], ds["aba"])
+    if report.empty:
+        st.success("Nenhum valor suspeito encontrado nas famílias da base.")
+        st.stop()
+
+    with st.sidebar:
+        st.markdown("### ⚙️ Filtros das Anomalias")
+        familias = st.multiselect("Famílias:", sorted(report["família"].unique()),
+                                  placeholder="Todas")
+        criterios = st.multiselect("Critérios:", list(ANOMALY_KINDS), placeholder="Todos")
+        min_gravidade = st.slider("Gravidade mínima (|z|):", 0.0, 10.0, 0.0, 0.5,
+                                  help="0 mantém também as linhas marcadas só pelo IQR (sem escore).")
+        quedas = st.checkbox("Só quedas entre edições")
+        termo = st.text_input("Filtrar por nome do município (opcional)")
+        aproximada = st.checkbox("Busca aproximada (tolera erros de digitação)")
+
+    params = (tuple(familias), tuple(criterios), min_gravidade, quedas, termo, aproximada)
+    filtrado = view_frame("anomalias", ds["caminho"], ds["aba"], params)
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Valores sinalizados", f"{len(filtrado)}", f"de {len(report)}", delta_color="off")
+    c2.metric("Municípios", f"{filtrado['Município'].nunique()}")
+    c3.metric("Famílias", f"{filtrado['família'].nunique()}")
+
+    st.subheader("📋 Valores suspeitos (mais graves primeiro)")
+    show_table(filtrado, key="anomalias")
+    download_buttons(ds, "anomalias", params, "relatorio_anomalias", "Baixar relatório")
+
+    if not filtrado.empty:
+        st.subheader("🧮 Resumo por família e critério")
+        resumo = (
+            filtrado.assign(critério=filtrado["critérios"].str.split(", "))
+            .explode("critério")
+            .pivot_table(index="família", columns="critério", values="Município", aggfunc="count", fill_value=0)
+        )
+        st.dataframe(resumo, use_container_width=True)
+
+    with st.expander("Como os valores são sinalizados"):
+        st.markdown("\n".join(f"- **{k}**: {desc}" for k, desc in ANOMALY_KINDS.items()))
+        st.caption(f"Por (família, ano), com a média anual de cada município: |z| > {Z_LIMITE}, "
+                   f"k = {IQR_K} nas cercas de Tukey; grupos com menos de {MIN_N} municípios ficam de fora. "
+                   "O salto compara com a edição anterior disponível do município (coluna \"ano anterior\") e é "
+                   "pontuado só entre municípios com a mesma transição.")
+
+if __name__ == "__main__":
+    render()
@@ -0,0 +1,156 @@
+"""Seção Comparador: barras de uma métrica, dispersão entre duas e correlações de todos os pares."""
+import streamlit as st
+
+from ideb import compare_bar, compare_scatter, ols_fit
+from painel.dados import (
+    download_buttons,
+    load_comparador_cube,
+    load_dataset,
+    load_municipio_index,
+    load_schema_index,
+    select_dataset,
+    show_chart,
+    show_table,
+    view_frame,
+)
+
+# cada aba é um fragmento: mexer nos controles de uma aba reexecuta só ela
+# (as outras abas e a preparação da base não rodam de novo)
+@st.fragment
+def _aba_barras(ds: dict, familias: dict, cube, sel_munis: list[str]) -> None:
+    st.subheader("📊 Barras — uma métrica em um ano")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        fam1 = st.selectbox("Família da métrica:", sorted(familias), key="cmp_fam1")
+    anos_fam1 = sorted(familias[fam1].keys())
+    with col2:
+        ano1 = st.selectbox("Ano:", anos_fam1, index=len(anos_fam1)-1, key="cmp_ano1")
+    with col3:
+        topn = st.slider("Top N (após filtro de municípios):", 2, min(50, len(sel_munis)), min(10, len(sel_munis)))
+
+    comp_top = compare_bar(cube, fam1, ano1, sel_munis, topn=topn)
+    show_chart(ds, "barras", (fam1, ano1, tuple(sel_munis), topn))
+
+    show_table(comp_top, key="barras")
+    download_buttons(ds, "barras", (fam1, ano1, tuple(sel_munis), topn),
+                     f"comparador_barras_{fam1}_{ano1}", "Baixar barras")
+
+@st.fragment
+def _aba_dispersao(ds: dict, comparador: dict, sel_munis: list[str]) -> None:
+    st.subheader("🔎 Dispersão — duas métricas (X vs Y)")
+
+    # IDEB e Censo (aprovação) lado a lado
+    familias_disp = comparador["familias"]
+    cube = comparador["cube"]
+    c1, c2 = st.columns(2)
+    with c1:
+        fam_x = st.selectbox("Família (eixo X):", sorted(familias_disp), key="cmp_fam_x")
+        anos_x = sorted(familias_disp[fam_x])
+        ano_x = st.selectbox("Ano (X):", anos_x, index=len(anos_x)-1, key="cmp_ano_x")
+    with c2:
+        fam_y = st.selectbox("Família (eixo Y):", sorted(familias_disp), key="cmp_fam_y")
+        anos_y = sorted(familias_disp[fam_y])
+        ano_y = st.selectbox("Ano (Y):", anos_y, index=len(anos_y)-1, key="cmp_ano_y")
+
+    scatter_df = compare_scatter(cube, fam_x, ano_x, fam_y, ano_y, sel_munis)
+
+    if scatter_df.empty:
+        st.warning("Sem dados numéricos suficientes para a combinação escolhida.")
+    else:
+        show_chart(ds, "dispersao", (fam_x, ano_x, fam_y, ano_y, tuple(sel_munis)))
+        ajuste = ols_fit(scatter_df["X"], scatter_df["Y"])
+        if ajuste:
+            st.caption(f"Reta ajustada (mínimos quadrados): Y = {ajuste['inclinação']:.4g}·X "
+                       f"{'+' if ajuste['intercepto'] >= 0 else '−'} {abs(ajuste['intercepto']):.4g} · "
+                       f"r = {ajuste['r']:.3f} · n = {ajuste['n']}")
+
+        show_table(scatter_df, key="dispersao")
+        download_buttons(ds, "dispersao", (fam_x, ano_x, fam_y, ano_y, tuple(sel_munis)),
+                         f"comparador_disp_{fam_x}_{ano_x}_vs_{fam_y}_{ano_y}", "Baixar dispersão")
+
+    for p in comparador["pareamento"]:
+        st.caption(f"Censo `{p['tabela']}`: {p['codigo']} municípios pareados pelo código, "
+                   f"{p['nome']} pelo nome, {p['sem_par']} sem par.")
+
+@st.fragment
+def _aba_correlacoes(ds: dict, familias_disp: dict) -> None:
+    st.subheader("📐 Correlações — todos os pares (família, ano)")
+    st.caption("Calculadas sobre **todos** os municípios da base (não só os selecionados); "
+               "cada par usa os municípios com valor nas duas métricas.")
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        metodo = st.radio("Correlação:", ["pearson", "spearman"], horizontal=True, key="cmp_corr_metodo")
+    with c2:
+        min_n = st.slider("Mínimo de municípios em comum:", 5, 50, 10, key="cmp_corr_min_n")
+    with c3:
+        termo_fam = st.text_input("Família contém (opcional):", key="cmp_corr_termo")
+
+    params_corr = (metodo, min_n, termo_fam)
+    pares = view_frame("correlacoes", ds["caminho"], ds["aba"], params_corr)
+    if pares.empty:
+        st.info("Nenhum par de métricas com municípios suficientes em comum.")
+    else:
+        show_table(pares, key="correlacoes", hide_index=True)
+        download_buttons(ds, "correlacoes", params_corr, f"correlacoes_{metodo}", "Baixar correlações")
+
+    familias_corr = sorted(familias_disp)
+    padrao_corr = [f for f in familias_corr if not f.startswith("CENSO_")][:4]
+    fams_heat = st.multiselect("Famílias no mapa de calor:", familias_corr, default=padrao_corr,
+                               key="cmp_corr_familias")
+    if fams_heat:
+        show_chart(ds, "heatmap", (metodo, tuple(fams_heat)))
+
+def render() -> None:
+    ds = select_dataset()
+    st.header(f"🔀 Comparador de Municípios — {ds['titulo']}")
+
+    try:
+        load_dataset(ds["caminho"], ds["aba"])
+    except Exception as e:
+        st.error(f"Não foi possível abrir o Excel: {e}")
+        st.stop()
+
+    # famílias com ano (índice pré-calculado: família -> ano -> posições)
+    schema = load_schema_index(ds["caminho"], ds["aba"])
+    familias = schema["familias"]
+    if not familias:
+        st.warning("Não encontrei colunas com ano no nome (padrão 20XX).")
+        st.stop()
+
+    # médias por (família, ano, município) já calculadas: cada aba só faz lookup
+    # (inclui as famílias CENSO_* quando há tabelas do Censo na pasta de dados)
+    comparador = load_comparador_cube(ds["caminho"], ds["aba"])
+
+    # Filtros laterais
+    with st.sidebar:
+        st.markdown("### ⚙️ Opções — Comparador")
+        municipios = load_municipio_index(ds["caminho"], ds["aba"])["opcoes"]
+        sel_munis = st.multiselect(
+            "Municípios (2+):",
+            municipios,
+            default=municipios[:5] if len(municipios) >= 5 else municipios
+        )
+
+    if len(sel_munis) < 2:
+        st.info("Selecione **pelo menos 2 municípios** para comparar.")
+        st.stop()
+
+    # Abas
+    tab_bar, tab_scatter, tab_corr = st.tabs(
+        ["📊 Barras (1 métrica)", "🔎 Dispersão (2 métricas)", "📐 Correlações (todos os pares)"]
+    )
+
+    with tab_bar:
+        _aba_barras(ds, familias, comparador["cube"], sel_munis)
+    with tab_scatter:
+        _aba_dispersao(ds, comparador, sel_munis)
+    with tab_corr:
+        _aba_correlacoes(ds, comparador["familias"])
+
+    st.caption(
+        "Barras: se houver múltiplas colunas para o mesmo ano (ex.: 2017_1…2017_4), usamos a **média**. "
+        "Dispersão: cada eixo usa a média da família/ano escolhidos."
+    )
+
+if __name__ == "__main__":
+    render()
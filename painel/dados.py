@@ -0,0 +1,513 @@
+"""
+Camada de dados do painel (Streamlit): caches, tabelas das visões, exportações e gráficos.
+
+Importado só pelas seções com dados; a lógica fica no pacote `ideb`, aqui ficam o
+cache do Streamlit, a contabilidade de acertos/erros e os componentes comuns
+(tabela paginada, botões de download, gráfico Vega-Lite, seletor de base).
+"""
+import os
+import shutil
+import threading
+import weakref
+
+import pandas as pd
+import streamlit as st
+
+from ideb import (
+    build_anomalies,
+    build_censo_cube,
+    build_cube,
+    build_long_table,
+    build_municipio_index,
+    build_ranking_index,
+    build_schema_index,
+    build_trajectory,
+    compare_bar,
+    compare_scatter,
+    correlation_matrix,
+    cube_matrix,
+    family_timeseries,
+    file_version,
+    filter_anomalies,
+    get_muni_label_col,
+    load_censo,
+    load_prepared,
+    load_workbook_sheets,
+    map_values,
+    municipio_mask,
+    normalize_text,
+    ols_fit,
+    pairwise_stats,
+    rank_municipios,
+    round_floats,
+    scan_catalog,
+    scan_censo,
+    search_municipios,
+    simplified_topology,
+    to_csv_bytes,
+    to_parquet_bytes,
+)
+from ideb import charts, geo, perf
+from ideb.loading import HAS_ARROW
+
+# =============================
+# CONFIGURAÇÃO
+# =============================
+ARQUIVO_IDEB = "IDEB_ensino_medio_municipios_2023_ES.xlsx"  # base padrão
+DATA_DIR = os.environ.get("IDEB_DATA_DIR", ".")
+# quantas bases preparadas ficam em memória ao mesmo tempo (LRU)
+MAX_DATASETS = int(os.environ.get("IDEB_MAX_DATASETS", "4"))
+# tempo de vida (s) das entradas de cache; expiradas são recalculadas na próxima chamada
+CACHE_TTL = int(os.environ.get("IDEB_CACHE_TTL", "3600"))
+# float64 -> float32 e textos repetidos -> category (IDEB_DOWNCAST=0 desliga)
+DOWNCAST = os.environ.get("IDEB_DOWNCAST", "1") != "0"
+# processos para parsear as abas de uma pasta de trabalho em paralelo (0 = núcleos da máquina)
+LOAD_WORKERS = int(os.environ.get("IDEB_LOAD_WORKERS", "0"))
+# linhas por página nas tabelas das seções: só a página visível é enviada ao navegador
+PAGE_SIZE = int(os.environ.get("IDEB_PAGE_SIZE", "50"))
+# acima disso, séries e dispersões são enviadas agregadas (faixa/média; grade de contagem)
+CHART_MAX_ROWS = int(os.environ.get("IDEB_CHART_MAX_ROWS", str(charts.CHART_MAX_ROWS)))
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# malha municipal: o TopoJSON do repositório ou, via IDEB_GEO_FILE, um GeoJSON/TopoJSON local
+# (ex.: malha do IBGE); a tolerância da simplificação (em graus) só vale para GeoJSON
+GEO_FILE = os.environ.get("IDEB_GEO_FILE", os.path.join(_RAIZ, "data", "municipios_ES.topo.json"))
+GEO_TOLERANCE = float(os.environ.get("IDEB_GEO_TOLERANCE", str(geo.GEO_TOLERANCE)))
+# pasta servida em app/static/ com server.enableStaticServing (ver .streamlit/config.toml)
+STATIC_DIR = os.path.join(_RAIZ, "static")
+
+# ===== Tabela paginada (fragmento: trocar de página reexecuta só a tabela) =====
+@st.fragment
+def show_table(df: pd.DataFrame, key: str, page_size: int = PAGE_SIZE, **kwargs) -> None:
+    """Tabela paginada no servidor: acima de `page_size` linhas aparece um seletor de página."""
+    inicio = 0
+    if len(df) > page_size:
+        paginas = -(-len(df) // page_size)
+        chave = f"pagina_{key}"
+        # página só pelo session_state (sem `value=`): semeia na 1ª vez e, se a tabela
+        # encolheu (outro filtro), volta para a última página válida
+        st.session_state[chave] = min(st.session_state.get(chave, 1), paginas)
+        pagina = st.number_input(f"Página (de {paginas})", min_value=1, max_value=paginas, key=chave)
+        inicio = (pagina - 1) * page_size
+        st.caption(f"Linhas {inicio + 1}–{min(inicio + page_size, len(df))} de {len(df)}")
+    with perf.stage("tabela (st.dataframe)"):
+        st.dataframe(df.iloc[inicio:inicio + page_size], use_container_width=True, **kwargs)
+
+# ===== Gestão de cache: contadores de acerto/erro e memória por entrada =====
+@st.cache_resource
+def _cache_stats() -> dict:
+    """
+    Estado do processo (sobrevive aos reruns e é comum a todas as sessões):
+    - "contadores": {cache: {"chamadas": n, "misses": n}};
+    - "objetos": {(cache, chave): weakref do DataFrame guardado} — some quando a entrada é despejada.
+    """
+    return {"lock": threading.Lock(), "contadores": {}, "objetos": {}}
+
+def _track_call(nome: str) -> None:
+    stats = _cache_stats()
+    with stats["lock"]:
+        stats["contadores"].setdefault(nome, {"chamadas": 0, "misses": 0})["chamadas"] += 1
+    perf.count_cache(nome, miss=False)
+
+def _track_miss(nome: str, chave, obj) -> None:
+    """Chamado de DENTRO das funções cacheadas: o corpo só executa quando não há acerto."""
+    stats = _cache_stats()
+    with stats["lock"]:
+        stats["contadores"].setdefault(nome, {"chamadas": 0, "misses": 0})["misses"] += 1
+        if isinstance(obj, pd.DataFrame):
+            stats["objetos"][(nome, chave)] = weakref.ref(obj)
+    perf.count_cache(nome, miss=True)
+
+def _cached(nome: str, fn, *args):
+    """Chama um loader cacheado contabilizando a chamada (e cronometrando, com perfil ligado)."""
+    _track_call(nome)
+    with perf.stage(nome):
+        return fn(*args)
+
+def cache_report() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Relatório para ajuste dos limites:
+    - por cache: chamadas, misses, hits e taxa de acerto;
+    - por DataFrame ainda em cache: linhas, colunas e bytes (memory_usage deep).
+    """
+    stats = _cache_stats()
+    with stats["lock"]:
+        contadores = {k: dict(v) for k, v in stats["contadores"].items()}
+        objetos = list(stats["objetos"].items())
+
+    linhas = []
+    for nome, c in sorted(contadores.items()):
+        hits = max(c["chamadas"] - c["misses"], 0)
+        taxa = hits / c["chamadas"] if c["chamadas"] else 0.0
+        linhas.append({"cache": nome, "chamadas": c["chamadas"], "misses": c["misses"],
+                       "hits": hits, "taxa de acerto": round(taxa, 3)})
+
+    frames = []
+    for (nome, chave), ref in objetos:
+        obj = ref()
+        if obj is None:
+            with stats["lock"]:
+                stats["objetos"].pop((nome, chave), None)
+            continue
+        frames.append({"cache": nome, "chave": str(chave), "linhas": len(obj),
+                       "colunas": obj.shape[1], "bytes": int(obj.memory_usage(deep=True).sum())})
+    return pd.DataFrame(linhas), pd.DataFrame(frames)
+
+# ===== Base preparada e derivados (cache por versão do arquivo, comum a todas as sessões) =====
+# A lógica fica no pacote `ideb`; aqui só o cache do Streamlit e a contabilidade.
+# uma pasta por vez: é só a fila de abas ainda não abertas; cada aba sai dela ao entrar em
+# `_prepared_dataset` (sujeita a IDEB_MAX_DATASETS) e a pasta vazia é descartada
+@st.cache_resource(show_spinner="Lendo as abas da planilha…", max_entries=1, ttl=CACHE_TTL)
+def _workbook(path: str, version: tuple[int, int]) -> dict:
+    # todas as abas de uma vez, em processos paralelos: o tempo acompanha a maior aba
+    abas = load_workbook_sheets(path, downcast=DOWNCAST, workers=LOAD_WORKERS or None)
+    _track_miss("pasta de trabalho", path, None)
+    return abas
+
+@st.cache_resource(show_spinner="Preparando a base…", max_entries=MAX_DATASETS, ttl=CACHE_TTL)
+def _prepared_dataset(path: str, sheet_name, version: tuple[int, int]) -> pd.DataFrame:
+    # `version` só participa da chave: muda quando o arquivo é alterado
+    df = None
+    if isinstance(sheet_name, str) and path.lower().endswith(".xlsx"):
+        # aba nomeada = pasta com várias abas no catálogo: preparadas juntas, em paralelo
+        abas = _cached("pasta de trabalho", _workbook, path, version)
+        df = abas.pop(sheet_name, None)
+        if not abas:
+            _workbook.clear(path, version)
+    if df is None:
+        # aba avulsa, ou já retirada da pasta e depois expulsa deste cache: só ela é relida
+        df = load_prepared(path, sheet_name, downcast=DOWNCAST)
+    _track_miss("base preparada", (path, sheet_name), df)
+    return df
+
+def load_dataset(path: str = ARQUIVO_IDEB, sheet_name=0) -> pd.DataFrame:
+    """
+    Retorna a base já preparada, calculada uma única vez por versão do arquivo
+    (caminho + mtime/tamanho) e compartilhada por todas as seções e sessões.
+    O DataFrame é somente leitura: as seções devem fatiar/copiar, nunca alterar in-place.
+    """
+    return _cached("base preparada", _prepared_dataset, path, sheet_name, file_version(path))
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_DATASETS, ttl=CACHE_TTL)
+def _schema_index(path: str, sheet_name, version: tuple[int, int]) -> dict:
+    df = _cached("base preparada", _prepared_dataset, path, sheet_name, version)
+    index = build_schema_index(df.columns)
+    _track_miss("índice de famílias", (path, sheet_name), index)
+    return index
+
+def load_schema_index(path: str = ARQUIVO_IDEB, sheet_name=0) -> dict:
+    """Índice de famílias da base preparada, calculado uma vez por versão do arquivo."""
+    return _cached("índice de famílias", _schema_index, path, sheet_name, file_version(path))
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_DATASETS, ttl=CACHE_TTL)
+def _long_table(path: str, sheet_name, version: tuple[int, int]) -> pd.DataFrame:
+    df = _cached("base preparada", _prepared_dataset, path, sheet_name, version)
+    index = _cached("índice de famílias", _schema_index, path, sheet_name, version)
+    _, label_col = get_muni_label_col(df)
+    long_df = build_long_table(df, index, label_col)
+    _track_miss("tabela longa", (path, sheet_name), long_df)
+    return long_df
+
+def load_long_table(path: str = ARQUIVO_IDEB, sheet_name=0) -> pd.DataFrame:
+    """Tabela longa da base preparada, calculada uma vez por versão do arquivo."""
+    return _cached("tabela longa", _long_table, path, sheet_name, file_version(path))
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_DATASETS, ttl=CACHE_TTL)
+def _cube(path: str, sheet_name, version: tuple[int, int]) -> pd.DataFrame:
+    cube = build_cube(_cached("tabela longa", _long_table, path, sheet_name, version))
+    _track_miss("cubo agregado", (path, sheet_name), cube)
+    return cube
+
+def load_cube(path: str = ARQUIVO_IDEB, sheet_name=0) -> pd.DataFrame:
+    """Cubo agregado da base preparada, calculado uma vez por versão do arquivo."""
+    return _cached("cubo agregado", _cube, path, sheet_name, file_version(path))
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_DATASETS, ttl=CACHE_TTL)
+def _municipio_index(path: str, sheet_name, version: tuple[int, int]) -> dict:
+    df = _cached("base preparada", _prepared_dataset, path, sheet_name, version)
+    idx = build_municipio_index(df)
+    _track_miss("índice de municípios", (path, sheet_name), idx)
+    return idx
+
+def load_municipio_index(path: str = ARQUIVO_IDEB, sheet_name=0) -> dict:
+    """Índice de municípios da base preparada, calculado uma vez por versão do arquivo."""
+    return _cached("índice de municípios", _municipio_index, path, sheet_name, file_version(path))
+
+@st.cache_resource(show_spinner="Calculando trajetórias…", max_entries=MAX_DATASETS, ttl=CACHE_TTL)
+def _trajectory(path: str, sheet_name, version: tuple[int, int]) -> pd.DataFrame:
+    df = _cached("base preparada", _prepared_dataset, path, sheet_name, version)
+    traj = build_trajectory(_cached("tabela longa", _long_table, path, sheet_name, version), len(df))
+    _track_miss("trajetória", (path, sheet_name), traj)
+    return traj
+
+def load_trajectory(path: str = ARQUIVO_IDEB, sheet_name=0) -> pd.DataFrame:
+    """Δ entre edições, CAGR e distância às metas de todos os municípios, uma vez por versão do arquivo."""
+    return _cached("trajetória", _trajectory, path, sheet_name, file_version(path))
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_DATASETS, ttl=CACHE_TTL)
+def _ranking_index(path: str, sheet_name, version: tuple[int, int]) -> dict:
+    df = _cached("base preparada", _prepared_dataset, path, sheet_name, version)
+    _, label_col = get_muni_label_col(df)
+    # métricas da base + trajetória: todas pré-ordenadas de uma vez
+    index = build_ranking_index(df, label_col, extra=_cached("trajetória", _trajectory, path, sheet_name, version))
+    _track_miss("índice de ranking", (path, sheet_name), index)
+    return index
+
+def load_ranking_index(path: str = ARQUIVO_IDEB, sheet_name=0) -> dict:
+    """Índice de ranking da base preparada, calculado uma vez por versão do arquivo."""
+    return _cached("índice de ranking", _ranking_index, path, sheet_name, file_version(path))
+
+@st.cache_resource(show_spinner="Procurando anomalias…", max_entries=MAX_DATASETS, ttl=CACHE_TTL)
+def _anomalies(path: str, sheet_name, version: tuple[int, int]) -> pd.DataFrame:
+    report = build_anomalies(_cached("cubo agregado", _cube, path, sheet_name, version))
+    _track_miss("anomalias", (path, sheet_name), report)
+    return report
+
+def load_anomalies(path: str = ARQUIVO_IDEB, sheet_name=0) -> pd.DataFrame:
+    """Relatório de anomalias (z robusto, IQR, saltos) de todas as famílias, uma vez por versão do arquivo."""
+    return _cached("anomalias", _anomalies, path, sheet_name, file_version(path))
+
+@st.cache_resource(show_spinner="Cruzando com o Censo Escolar…", max_entries=MAX_DATASETS, ttl=CACHE_TTL)
+def _comparador_cube(path: str, sheet_name, version: tuple[int, int], fontes: tuple) -> dict:
+    # `fontes`: ((caminho, versão), ...) das tabelas do Censo — entram na chave do cache
+    cube = _cached("cubo agregado", _cube, path, sheet_name, version)
+    pareamento = []
+    if fontes:
+        df = _cached("base preparada", _prepared_dataset, path, sheet_name, version)
+        censo_cube, stats = build_censo_cube(df, [load_censo(c) for c, _ in fontes])
+        cube = pd.concat([cube, censo_cube]).sort_index()
+        pareamento = [{"tabela": os.path.basename(c), **p} for (c, _), p in zip(fontes, stats)]
+    familias = {}
+    for fam, ano in cube.index.droplevel("Município").unique():
+        familias.setdefault(fam, []).append(ano)
+    out = {"cube": cube, "familias": familias, "pareamento": pareamento}
+    _track_miss("cubo com Censo", (path, sheet_name), cube)
+    return out
+
+def load_comparador_cube(path: str = ARQUIVO_IDEB, sheet_name=0) -> dict:
+    """
+    Cubo da base + famílias CENSO_* das tabelas do Censo em DATA_DIR, unidos uma vez por
+    versão dos arquivos: {"cube", "familias": {família: [anos]}, "pareamento": [...]}.
+    """
+    fontes = tuple((c, file_version(c)) for c in load_censo_catalog(DATA_DIR))
+    return _cached("cubo com Censo", _comparador_cube, path, sheet_name, file_version(path), fontes)
+
+@st.cache_resource(show_spinner="Calculando correlações…", max_entries=MAX_DATASETS, ttl=CACHE_TTL)
+def _correlations(path: str, sheet_name, version: tuple[int, int], fontes: tuple) -> dict:
+    cube = _cached("cubo com Censo", _comparador_cube, path, sheet_name, version, fontes)["cube"]
+    wide = cube_matrix(cube)
+    out = {
+        "pares": pairwise_stats(wide),
+        "pearson": correlation_matrix(wide, "pearson"),
+        "spearman": correlation_matrix(wide, "spearman"),
+    }
+    _track_miss("correlações", (path, sheet_name), out["pares"])
+    return out
+
+def load_correlations(path: str = ARQUIVO_IDEB, sheet_name=0) -> dict:
+    """
+    Correlações/regressões de todos os pares (família, ano), entre todos os municípios,
+    calculadas uma vez por versão da base (e das tabelas do Censo):
+    {"pares": tabela por par, "pearson"/"spearman": matrizes}.
+    """
+    fontes = tuple((c, file_version(c)) for c in load_censo_catalog(DATA_DIR))
+    return _cached("correlações", _correlations, path, sheet_name, file_version(path), fontes)
+
+@st.cache_resource(show_spinner="Simplificando a malha municipal…", max_entries=2, ttl=CACHE_TTL)
+def _geometry(path: str, version: tuple[int, int], tolerancia: float) -> dict:
+    arquivo, topologia = simplified_topology(path, tolerancia)
+    nome = os.path.basename(arquivo)
+    fonte = {"format": {"type": "topojson", "feature": geo.GEO_OBJECT}}
+    if st.get_option("server.enableStaticServing"):
+        # o navegador baixa a malha uma vez (URL muda com a versão); o gráfico leva só os valores
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        stem = nome.rsplit("-", 1)[0]
+        for antigo in os.listdir(STATIC_DIR):
+            if antigo.startswith(f"{stem}-") and antigo.endswith(".topo.json") and antigo != nome:
+                os.remove(os.path.join(STATIC_DIR, antigo))
+        if not os.path.exists(os.path.join(STATIC_DIR, nome)):
+            shutil.copyfile(arquivo, os.path.join(STATIC_DIR, nome))
+        fonte["url"] = f"app/static/{nome}"
+    else:
+        fonte["values"] = topologia
+    malha = {"malha": fonte, "chave": nome, "bytes": os.path.getsize(arquivo), **topologia["ideb"]}
+    _track_miss("malha municipal", (path,), malha)
+    return malha
+
+def load_geometry(path: str = GEO_FILE) -> dict | None:
+    """
+    Malha simplificada para `charts.choropleth_chart`, uma vez por versão do arquivo;
+    None se o arquivo não existir. "chave" identifica a versão (entra nos parâmetros do mapa).
+    """
+    if not os.path.exists(path):
+        return None
+    return _cached("malha municipal", _geometry, path, file_version(path), GEO_TOLERANCE)
+
+@st.cache_data(show_spinner=False, ttl=60, max_entries=8)
+def load_censo_catalog(data_dir: str = DATA_DIR) -> list[str]:
+    return scan_censo(data_dir)
+
+@st.cache_data(show_spinner=False, ttl=60, max_entries=8)
+def load_catalog(data_dir: str = DATA_DIR) -> list[dict]:
+    # Listagem barata; o TTL curto faz novos arquivos aparecerem sem reiniciar o app
+    return scan_catalog(data_dir)
+
+# ===== Tabelas das visões (refeitas a partir dos parâmetros da tela, para exportações e gráficos) =====
+def view_frame(view: str, path: str, sheet_name, params: tuple) -> pd.DataFrame:
+    """Recalcula a tabela de uma visão a partir dos mesmos parâmetros usados na tela."""
+    if view == "panorama":
+        col_cat, col_y, n_top = params
+        df = load_dataset(path, sheet_name)
+        return (
+            df[[col_cat, col_y]]
+            .dropna()
+            .assign(**{col_cat: lambda d: d[col_cat].astype(str)})
+            .sort_values(col_y, ascending=False)
+            .head(n_top)
+        )
+    if view == "ranking":
+        metrica, asc, termo, aproximada, topn = params
+        mask = None
+        if termo.strip():
+            mask = municipio_mask(load_municipio_index(path, sheet_name), termo, aproximada=aproximada)
+        return rank_municipios(load_ranking_index(path, sheet_name), metrica, ascending=asc, mask=mask, topn=topn)
+    if view == "serie":
+        familia, municipios = params
+        return family_timeseries(load_long_table(path, sheet_name), familia, list(municipios))
+    if view == "barras":
+        familia, ano, municipios, topn = params
+        return compare_bar(load_cube(path, sheet_name), familia, ano, list(municipios), topn=topn)
+    if view == "dispersao":
+        fam_x, ano_x, fam_y, ano_y, municipios = params
+        cube = load_comparador_cube(path, sheet_name)["cube"]
+        return compare_scatter(cube, fam_x, ano_x, fam_y, ano_y, list(municipios))
+    if view == "correlacoes":
+        metodo, min_n, termo = params
+        pares = load_correlations(path, sheet_name)["pares"]
+        pares = pares[pares["n"] >= min_n]
+        if termo.strip():
+            t = termo.strip().upper()
+            pares = pares[pares["X família"].str.contains(t, regex=False)
+                          | pares["Y família"].str.contains(t, regex=False)]
+        return pares.sort_values(metodo, key=abs, ascending=False, kind="mergesort").reset_index(drop=True)
+    if view == "heatmap":
+        metodo, familias = params
+        matriz = load_correlations(path, sheet_name)[metodo]
+        sel = [c for c in matriz.columns if c[0] in familias]
+        return matriz.loc[sel, sel]
+    if view == "anomalias":
+        familias, criterios, min_gravidade, quedas, termo, aproximada = params
+        report = filter_anomalies(load_anomalies(path, sheet_name), familias, criterios, min_gravidade, quedas)
+        if termo.strip():
+            index = load_municipio_index(path, sheet_name)
+            chaves = {index["chaves"][i] for i in search_municipios(index, termo, aproximada=aproximada)}
+            report = report[report["Município"].map(normalize_text).isin(chaves)].reset_index(drop=True)
+        return report
+    if view == "mapa":
+        familia, ano, _ = params
+        return map_values(load_cube(path, sheet_name), familia, ano,
+                          load_municipio_index(path, sheet_name)["nome_codigo"])
+    raise ValueError(f"Visão desconhecida: {view}")
+
+# ===== Exportações sob demanda: geradas só no clique e cacheadas pelos parâmetros da visão =====
+@st.cache_data(show_spinner=False, max_entries=32, ttl=CACHE_TTL)
+def _export_bytes(view: str, fmt: str, path: str, sheet_name, version: tuple[int, int], params: tuple) -> bytes:
+    df = view_frame(view, path, sheet_name, params)
+    return to_parquet_bytes(df) if fmt == "parquet" else to_csv_bytes(df)
+
+def download_buttons(ds: dict, view: str, params: tuple, nome: str, rotulo: str) -> None:
+    """
+    Botões CSV (e Parquet, com pyarrow) da visão `view` da base `ds` (ver `select_dataset`):
+    - o arquivo só é gerado quando o botão é clicado, fora do rerun;
+    - o resultado fica em cache por (visão, formato, base, versão, parâmetros).
+    """
+    path, sheet, version = ds["caminho"], ds["aba"], file_version(ds["caminho"])
+    formatos = [("csv", "text/csv")]
+    if HAS_ARROW:
+        formatos.append(("parquet", "application/vnd.apache.parquet"))
+    for col, (fmt, mime) in zip(st.columns(len(formatos)), formatos):
+        col.download_button(
+            f"⬇️ {rotulo} ({fmt.upper()})",
+            data=lambda fmt=fmt: _export_bytes(view, fmt, path, sheet, version, params),
+            file_name=f"{nome}.{fmt}",
+            mime=mime,
+            key=f"download_{view}_{fmt}",
+        )
+
+# ===== Gráficos: spec Vega-Lite + dados à parte, memoizados por (visão, base, versão, parâmetros) =====
+@st.cache_data(show_spinner=False, max_entries=64, ttl=CACHE_TTL)
+def _chart(view: str, path: str, sheet_name, version: tuple[int, int], params: tuple,
+           media: bool = False) -> tuple[pd.DataFrame, dict]:
+    data, spec = _chart_spec(view, view_frame(view, path, sheet_name, params), params, media)
+    # mesmo arredondamento da exportação: tooltips sem ruído de float32 (79.30000305 -> 79.3)
+    return round_floats(data), spec
+
+def _chart_spec(view: str, df: pd.DataFrame, params: tuple, media: bool) -> tuple[pd.DataFrame, dict]:
+    if view == "panorama":
+        col_cat, col_y, _ = params
+        return charts.bar_chart(df, col_cat, col_y)
+    if view == "ranking":
+        metrica = params[0]
+        return charts.bar_chart(df, "Município", metrica, tooltip=["Posição", "Município", metrica])
+    if view == "barras":
+        familia, ano = params[:2]
+        return charts.bar_chart(df, "Município", "valor", titulo_y=f"{familia} — {ano}")
+    if view == "serie":
+        return charts.series_chart(df, params[0], media=media, max_rows=CHART_MAX_ROWS)
+    if view == "dispersao":
+        fam_x, ano_x, fam_y, ano_y, _ = params
+        return charts.scatter_chart(df, f"{fam_x} — {ano_x}", f"{fam_y} — {ano_y}", max_rows=CHART_MAX_ROWS,
+                                    ajuste=ols_fit(df["X"], df["Y"]))
+    if view == "heatmap":
+        return charts.heatmap_chart(df, titulo=params[0])
+    if view == "mapa":
+        familia, ano, _ = params
+        return charts.choropleth_chart(df, load_geometry()["malha"], f"{familia} — {ano}")
+    raise ValueError(f"Visão sem gráfico: {view}")
+
+def show_chart(ds: dict, view: str, params: tuple, **opcoes) -> None:
+    """Desenha o gráfico da visão `view` da base `ds` (os dados vão em Arrow, fora do spec)."""
+    with perf.stage("gráfico (Vega-Lite)"):
+        data, spec = _chart(view, ds["caminho"], ds["aba"], file_version(ds["caminho"]), params, **opcoes)
+        st.vega_lite_chart(data, spec, use_container_width=True)
+
+# ===== Seletor de base e painel de cache (barra lateral) =====
+def select_dataset() -> dict:
+    """
+    Seletor da base na barra lateral (catálogo da pasta de dados). Devolve a entrada do
+    catálogo escolhida ("caminho", "aba", "etapa", "uf", ...) com "nome" (arquivo) e
+    "titulo" (ex.: "Ensino Médio (ES)"); sem nenhuma base, interrompe o script.
+    """
+    with perf.stage("catálogo de bases"):
+        catalogo = load_catalog(DATA_DIR)
+    if not catalogo:
+        st.error(f"Nenhuma base (`.xlsx` ou `.csv`) encontrada em `{DATA_DIR}`.")
+        st.stop()
+    rotulos = [d["rotulo"] for d in catalogo]
+    padrao = next(
+        (i for i, d in enumerate(catalogo) if os.path.basename(d["caminho"]) == ARQUIVO_IDEB), 0
+    )
+    # a escolha fica também fora do widget ("base"): estado de widget não passa de uma página para outra
+    if st.session_state.get("base") in rotulos:
+        padrao = rotulos.index(st.session_state["base"])
+    escolha = st.sidebar.selectbox("Base de dados:", rotulos, index=padrao, key="dataset")
+    st.session_state["base"] = escolha
+    dataset = catalogo[rotulos.index(escolha)]
+    return {
+        **dataset,
+        "nome": os.path.basename(dataset["caminho"]),
+        "titulo": f"{dataset['etapa']} ({dataset['uf']})" if dataset["uf"] else dataset["etapa"],
+    }
+
+def cache_panel() -> None:
+    """Quadro dos operadores (IDEB_CACHE_PANEL=1 ou ?cache=1): acertos, memória e limpeza dos caches."""
+    with st.sidebar.expander("🧮 Cache e memória"):
+        st.caption(f"Limites: {MAX_DATASETS} bases por cache · TTL {CACHE_TTL}s · downcast {'ligado' if DOWNCAST else 'desligado'}")
+        contadores, frames = cache_report()
+        st.dataframe(contadores, use_container_width=True, hide_index=True)
+        if not frames.empty:
+            st.dataframe(frames, use_container_width=True, hide_index=True)
+            st.metric("Total em cache (MB)", f"{frames['bytes'].sum() / 2**20:.2f}")
+        if st.button("Limpar caches"):
+            st.cache_data.clear()
+            st.cache_resource.clear()
+            st.rerun()
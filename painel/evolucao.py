@@ -0,0 +1,77 @@
+"""Seção Evolução Temporal: série de uma família de métricas para os municípios escolhidos."""
+import streamlit as st
+
+from ideb import family_timeseries, get_muni_label_col
+from painel.dados import (
+    download_buttons,
+    load_dataset,
+    load_long_table,
+    load_municipio_index,
+    load_schema_index,
+    select_dataset,
+    show_chart,
+    show_table,
+)
+
+def render() -> None:
+    ds = select_dataset()
+    st.header(f"📈 Evolução Temporal — {ds['titulo']}")
+
+    try:
+        df = load_dataset(ds["caminho"], ds["aba"])
+    except Exception as e:
+        st.error(f"Não foi possível abrir o Excel: {e}")
+        st.stop()
+
+    # >>> usar nome (label)
+    code_col, label_col = get_muni_label_col(df)
+
+    # Famílias de colunas com ANO no nome (índice pré-calculado)
+    schema = load_schema_index(ds["caminho"], ds["aba"])
+    familias = schema["familias"]
+    if not familias:
+        st.warning("Não encontrei colunas com ano no nome (padrão 20XX).")
+        st.stop()
+
+    familias_ordenadas = sorted(familias.keys())
+
+    # Opções
+    with st.sidebar:
+        st.markdown("### ⚙️ Opções — Evolução")
+        fam_escolhida = st.selectbox("Família da métrica:", familias_ordenadas)
+        municipios = load_municipio_index(ds["caminho"], ds["aba"])["opcoes"]
+        sel_munis = st.multiselect(
+            "Municípios (1 ou mais):",
+            municipios,
+            default=municipios[:3] if len(municipios) >= 3 else municipios
+        )
+        mostrar_media_estado = st.checkbox("Incluir média do Estado (entre municípios selecionados)")
+
+    if not sel_munis:
+        st.info("Selecione ao menos um município.")
+        st.stop()
+
+    # Tabela "longa" (pré-calculada para todas as famílias; aqui é só filtro)
+    long_df = family_timeseries(load_long_table(ds["caminho"], ds["aba"]), fam_escolhida, sel_munis)
+
+    if long_df.empty:
+        st.warning("Não foi possível extrair valores numéricos da família selecionada.")
+    else:
+        # Gráfico
+        st.subheader(f"📊 Série temporal — {fam_escolhida}")
+        # média estadual (opcional) entra como camada do mesmo gráfico
+        show_chart(ds, "serie", (fam_escolhida, tuple(sel_munis)), media=mostrar_media_estado)
+
+        # Tabela e download
+        st.subheader("🗂️ Dados (formato long)")
+        show_table(long_df, key="serie")
+        download_buttons(ds, "serie", (fam_escolhida, tuple(sel_munis)),
+                         f"serie_temporal_{fam_escolhida}", "Baixar série")
+
+        st.caption(
+            "Observação: quando há múltiplas colunas no mesmo ano (ex.: 2017_1, 2017_2, 2017_3, 2017_4), "
+            "o valor anual mostrado é a **média** dessas colunas."
+        )
+
+if __name__ == "__main__":
+    render()
@@ -0,0 +1,45 @@
+"""Seção Início: apresentação do projeto (só texto, sem carregar dados)."""
+import streamlit as st
+
+def render() -> None:
+    st.title("📈 Painel IDEB – Rede Estadual/ES (por Município)")
+
+    st.markdown(
+        """
+        Esta aplicação apresenta um MVP (Produto Mínimo Viável) como parte da avaliação da disciplina de **Cloud Computing**
+        para produtos de dados na Pós-graduação em **Mineração de Dados**.
+
+        - Professor: **Maxwell Monteiro**  
+        - Aluna: **Luciene Dellaqua Bergamin**
+        """
+    )
+
+    st.subheader("Objetivo do Projeto")
+    st.write(
+        """
+        Criar um painel de apresentação para exploração do **IDEB (Índice de Desenvolvimento da Educação Básica)** da rede 
+        estadual do Espírito Santo, com foco em visualizações e comparações **por município**.
+        """
+    )
+
+    st.subheader("O que é o IDEB (resumo)")
+    st.write(
+        """
+        O IDEB combina **aprendizado** (proficiência medida pelo **Saeb**) e **fluxo escolar** (principalmente a **taxa de aprovação**
+        do Censo Escolar). De forma simplificada, o indicador reflete quanto os estudantes **aprendem** e **progridem** ao longo do tempo.
+        É divulgado bianualmente e pode ser analisado por **rede**, **município** e **escola**.
+        """
+    )
+
+    st.subheader("Fontes dos Dados (apenas IDEB e Censo Escolar)")
+    st.write(
+        """
+        - **INEP / Saeb** – Proficiências em Língua Portuguesa e Matemática utilizadas na composição do **IDEB**.  
+        - **INEP / Censo Escolar (Situação do Aluno)** – Indicadores de **aprovação** que integram o **IDEB**.
+        """
+    )
+
+    st.info("Navegue pelas seções no menu à esquerda para explorar a estrutura.")
+
+if __name__ == "__main__":
+    render()
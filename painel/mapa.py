@@ -0,0 +1,74 @@
+"""Seção Mapa: coroplético de uma métrica por município, com a malha local simplificada."""
+import os
+
+import streamlit as st
+
+from painel.dados import (
+    GEO_FILE,
+    download_buttons,
+    load_dataset,
+    load_geometry,
+    load_municipio_index,
+    load_schema_index,
+    select_dataset,
+    show_chart,
+    show_table,
+    view_frame,
+)
+
+# fragmento: trocar família/ano redesenha só o mapa (a malha já está no navegador)
+@st.fragment
+def _mapa(ds: dict, familias: dict, malha: dict) -> None:
+    c1, c2 = st.columns(2)
+    with c1:
+        familia = st.selectbox("Família da métrica:", sorted(familias), key="mapa_fam")
+    anos = sorted(familias[familia])
+    with c2:
+        ano = st.selectbox("Ano:", anos, index=len(anos) - 1, key="mapa_ano")
+
+    params = (familia, ano, malha["chave"])
+    valores = view_frame("mapa", ds["caminho"], ds["aba"], params)
+    if valores.empty:
+        st.warning("Sem valores dessa métrica para os municípios com código.")
+        return
+    show_chart(ds, "mapa", params)
+
+    with st.expander("Ver dados do mapa"):
+        show_table(valores, key="mapa")
+        download_buttons(ds, "mapa", params, f"mapa_{familia}_{ano}", "Baixar valores")
+
+def render() -> None:
+    ds = select_dataset()
+    st.header(f"🗺️ Mapa — {ds['titulo']}")
+
+    try:
+        load_dataset(ds["caminho"], ds["aba"])
+    except Exception as e:
+        st.error(f"Não foi possível abrir o Excel: {e}")
+        st.stop()
+
+    if not load_municipio_index(ds["caminho"], ds["aba"])["nome_codigo"]:
+        st.error("A base não tem coluna de código do município (ex.: `CO_MUNICIPIO`) para ligar ao mapa.")
+        st.stop()
+
+    malha = load_geometry()
+    if malha is None:
+        st.info(
+            f"Malha municipal não encontrada em `{GEO_FILE}`. Aponte `IDEB_GEO_FILE` para o GeoJSON "
+            "dos municípios (ex.: malha do IBGE, `servicodados.ibge.gov.br/api/v3/malhas/estados/32?"
+            "intrarregiao=municipio&formato=application/vnd.geo+json`) ou para um TopoJSON gerado com "
+            "`python -m ideb.geo`; a simplificação é feita uma vez e fica em cache."
+        )
+        st.stop()
+
+    _mapa(ds, load_schema_index(ds["caminho"], ds["aba"])["familias"], malha)
+
+    entrega = "arquivo estático (baixado uma vez)" if "url" in malha["malha"] else "embutida no gráfico"
+    pontos = f"{malha['pontos_originais']:,} → {malha['pontos']:,}".replace(",", ".")
+    st.caption(
+        f"Malha `{os.path.basename(GEO_FILE)}`: {malha['municipios']} municípios, {pontos} pontos após "
+        f"a simplificação, {malha['bytes'] / 1024:.0f} KB em TopoJSON, {entrega}."
+    )
+
+if __name__ == "__main__":
+    render()
@@ -0,0 +1,24 @@
+"""Seção Metodologia & Fontes (só texto)."""
+import streamlit as st
+
+def render() -> None:
+    st.header("Metodologia & Fontes")
+    st.markdown(
+        """
+        - **Fonte**: INEP/SAEB (proficiências) e indicadores do IDEB.  
+        - **Tratamento**: normalização de rótulos de rede, conversão robusta de colunas numéricas, 
+          preenchimento forward-fill em colunas textuais agrupadas e uso de médias quando uma métrica 
+          se repete em múltiplas colunas por ano.
+        - **Censo Escolar**: tabelas `CENSO_<descrição>_<ano>[_<UF>]` na pasta de dados (taxas de
+          aprovação, rede Estadual, localização Total) são pareadas à base pelo código do município
+          (ou, na falta dele, pelo nome sem acentos) e aparecem no Comparador como famílias `CENSO_*`.
+        - **Anomalias**: em cada (família, ano), z robusto pela mediana/MAD (|z| > 3,5) e cercas de
+          Tukey (1,5 x IQR); saltos entre edições avaliados da mesma forma entre os municípios
+          com a mesma transição (ano anterior -> ano).
+        - **Mapa**: malha municipal local (ex.: IBGE), simplificada (Douglas–Peucker) e ligada à base
+          pelo código IBGE do município.
+        """
+    )
+
+if __name__ == "__main__":
+    render()
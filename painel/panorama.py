@@ -0,0 +1,57 @@
+"""Seção Panorama IDEB: prévia da base, `describe()` e barras de uma métrica livre."""
+import streamlit as st
+
+from ideb import detect_muni_col
+from painel.dados import load_dataset, select_dataset, show_chart, show_table, view_frame
+
+# fragmento: trocar coluna/métrica/Top N redesenha só o gráfico (prévia e describe() não rodam de novo)
+@st.fragment
+def _grafico_barras(ds: dict, df, num_cols: list[str]) -> None:
+    muni_col_guess = detect_muni_col(df)
+    col_cat = st.selectbox("Coluna categórica (X):", df.columns, index=list(df.columns).index(muni_col_guess))
+    sugestoes = [c for c in num_cols if any(k in c.lower() for k in ["ideb", "nota", "índice", "indice", "profici", "aprova"])]
+    y_default = sugestoes[0] if sugestoes else num_cols[0]
+    col_y = st.selectbox("Métrica (Y):", num_cols, index=num_cols.index(y_default))
+    n_top = st.slider("Quantidade de municípios (Top N):", 5, min(30, len(df)), min(15, len(df)))
+
+    show_chart(ds, "panorama", (col_cat, col_y, n_top))
+
+    with st.expander("Ver dados do gráfico"):
+        base = view_frame("panorama", ds["caminho"], ds["aba"], (col_cat, col_y, n_top))
+        show_table(base, key="grafico_panorama")
+
+def render() -> None:
+    ds = select_dataset()
+    st.header(f"Panorama IDEB – {ds['etapa']} (Municípios/{ds['uf']})")
+
+    try:
+        df = load_dataset(ds["caminho"], ds["aba"])
+        st.success(f"Base `{ds['nome']}` carregada.")
+    except FileNotFoundError:
+        st.error(f"Arquivo `{ds['nome']}` não encontrado.")
+        st.stop()
+    except Exception as e:
+        st.error(f"Não foi possível ler o Excel: {e}")
+        st.stop()
+
+    # Prévia
+    st.subheader("🔍 Prévia da Tabela")
+    show_table(df, key="previa", page_size=20)
+
+    # (1) Tabela descritiva
+    st.subheader("📈 Estatísticas Descritivas (Pandas `describe()`)")
+    desc = df.select_dtypes(include="number").describe().T
+    show_table(desc, key="describe")
+
+    # (2) Gráfico de barras (livre)
+    st.subheader("📊 Gráfico de Barras – municípios x métrica")
+    num_cols = df.select_dtypes(include="number").columns.tolist()
+    if not num_cols:
+        st.error("Não há colunas numéricas para plotar.")
+        st.stop()
+    _grafico_barras(ds, df, num_cols)
+
+    st.caption("✔ Requisitos do MVP atendidos: `describe()` + 1 gráfico.")
+
+if __name__ == "__main__":
+    render()
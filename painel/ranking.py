@@ -0,0 +1,74 @@
+"""Seção Ranking de Municípios: métrica pré-ordenada, filtro por nome, tabela, download e gráfico."""
+
+import streamlit as st
+
+from ideb import municipio_mask, rank_municipios, safe_filename, trajectory_kind
+from ideb.trajectory import TRAJECTORY_KINDS
+from painel.dados import (
+    download_buttons,
+    load_dataset,
+    load_municipio_index,
+    load_ranking_index,
+    select_dataset,
+    show_chart,
+    show_table,
+)
+
+def render() -> None:
+    ds = select_dataset()
+    st.header(f"🏆 Ranking de Municípios — {ds['titulo']}")
+
+    try:
+        df = load_dataset(ds["caminho"], ds["aba"])
+    except Exception as e:
+        st.error(f"Não foi possível abrir o Excel: {e}")
+        st.stop()
+
+    # métricas já pré-ordenadas nas duas direções
+    rank_idx = load_ranking_index(ds["caminho"], ds["aba"])
+    num_cols = list(rank_idx["ordens"])
+    if not num_cols:
+        st.error("A base não possui colunas numéricas para ranquear.")
+        st.stop()
+
+    # métricas da base e de trajetória (Δ, CAGR, meta), calculadas para todos os municípios
+    tipos = {"Valores da base": None}
+    tipos.update({desc: k for k, desc in TRAJECTORY_KINDS.items()
+                  if any(trajectory_kind(c) == k for c in num_cols)})
+
+    with st.sidebar:
+        st.markdown("### ⚙️ Opções do Ranking")
+        tipo = st.radio("Tipo de métrica:", list(tipos), index=0) if len(tipos) > 1 else "Valores da base"
+        opcoes = [c for c in num_cols if trajectory_kind(c) == tipos[tipo]]
+        sugestoes = [c for c in opcoes if any(k in c.lower() for k in ["ideb", "nota", "índice", "indice", "profici", "aprova"])]
+        metrica_default = sugestoes[0] if sugestoes else opcoes[0]
+        metrica = st.selectbox("Métrica:", opcoes, index=opcoes.index(metrica_default))
+        ordem = st.radio("Ordenação:", ["Maior → Menor", "Menor → Maior"], index=0, horizontal=True)
+        topn = st.slider("Top N", min_value=5, max_value=min(100, len(df)), value=min(20, len(df)))
+        termo = st.text_input("Filtrar por nome do município (opcional)")
+        aproximada = st.checkbox("Busca aproximada (tolera erros de digitação)")
+
+    # filtro por nome sem acento/caixa; Top N e ordem são só fatias do índice
+    asc = (ordem == "Menor → Maior")
+    mask = None
+    if termo.strip():
+        mask = municipio_mask(load_municipio_index(ds["caminho"], ds["aba"]), termo, aproximada=aproximada)
+    ranking = rank_municipios(rank_idx, metrica, ascending=asc, mask=mask, topn=topn)
+
+    st.subheader("📋 Tabela do Ranking")
+    show_table(ranking, key="ranking")
+
+    # nomes de trajetória têm espaços, "→" e "%"
+    download_buttons(ds, "ranking", (metrica, asc, termo, aproximada, topn),
+                     safe_filename(f"ranking_municipios_{metrica}"), "Baixar ranking")
+
+    st.subheader("📊 Top N — Gráfico de Barras")
+    show_chart(ds, "ranking", (metrica, asc, termo, aproximada, topn))
+
+    if tipos[tipo]:
+        st.caption(f"{tipo}: calculado para todos os municípios a partir das médias anuais de cada família. "
+                   "CAGR só quando os valores inicial e final são positivos; meta = observado − projeção do INEP.")
+    st.caption("Dica: ajuste a métrica, a ordenação e use o filtro para localizar um município.")
+
+if __name__ == "__main__":
+    render()
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from ideb.anomalies import build_anomalies
+
+def _cube(valores: dict) -> pd.DataFrame:
+    """Cubo de uma família só: {município: {ano: valor}} -> índice (família, ano, Município)."""
+    linhas = [("VL_OBSERVADO", ano, muni, v) for muni, serie in valores.items() for ano, v in serie.items()]
+    df = pd.DataFrame(linhas, columns=["família", "ano", "Município", "valor"])
+    return df.set_index(["família", "ano", "Município"]).sort_index()
+
+def _consecutivos() -> dict:
+    # dez municípios com as três edições e variações pequenas e parecidas entre elas
+    return {f"M{i}": {2017: 4.0 + 0.1 * i, 2019: 4.2 + 0.1 * i, 2021: 4.4 + 0.1 * i + 0.02 * (i % 3)}
+            for i in range(10)}
+
+def test_salto_sem_edicao_intermediaria_nao_e_pontuado_com_os_consecutivos():
+    valores = _consecutivos()
+    # sem 2019: a variação 2017 -> 2021 acumula duas transições e não é comparável às demais
+    valores["Pulou"] = {2017: 4.0, 2021: 5.0}
+    report = build_anomalies(_cube(valores))
+
+    pulou = report[report["Município"] == "Pulou"]
+    assert pulou.empty or not pulou["critérios"].str.contains("salto").any()
+
+def test_salto_sem_edicao_intermediaria_pontuado_entre_os_que_pularam():
+    valores = _consecutivos()
+    for i in range(6):
+        valores[f"P{i}"] = {2017: 4.0, 2021: 4.8 + 0.01 * i}
+    valores["P6"] = {2017: 4.0, 2021: 7.0}
+    report = build_anomalies(_cube(valores)).set_index("Município")
+
+    assert report.loc["P6", "ano anterior"] == 2017
+    assert "salto" in report.loc["P6", "critérios"]
+    consecutivos = report[report.index.str.startswith("M")]
+    assert not consecutivos["critérios"].str.contains("salto").any()
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from ideb.censo import join_censo, prepare_censo
+
+def _base() -> pd.DataFrame:
+    return pd.DataFrame({
+        "CO_MUNICIPIO": [3200102, 3200136, 3200201, 3200300, 3200409, 3200508],
+        "NO_MUNICIPIO": ["Afonso Cláudio", "Águia Branca", "Alegre", "Alfredo Chaves", "Anchieta", "Aracruz"],
+    })
+
+def test_linhas_sem_codigo_pareiam_pelo_nome():
+    raw = pd.DataFrame({
+        "CO_MUNICIPIO": ["320010", "320013", None, None, ""],
+        "NO_MUNICIPIO": ["Afonso Cláudio", "Águia Branca", "Alegre", "ALFREDO CHAVES", "Anchieta"],
+        "REDE": ["Estadual"] * 5,
+        "ANO": ["2023"] * 5,
+        "Taxa de Aprovação": ["90,1", "88", "80", "70,5", "75"],
+    })
+    censo = prepare_censo(raw)
+    assert censo.index.isna().sum() == 3
+
+    out = join_censo(_base(), censo)
+    assert out.attrs["pareamento"] == {"codigo": 2, "nome": 3, "sem_par": 1}
+    assert out["CENSO_TAXA_DE_APROVACAO_2023"].tolist()[:5] == [90.1, 88.0, 80.0, 70.5, 75.0]
+    assert pd.isna(out["CENSO_TAXA_DE_APROVACAO_2023"].iloc[5])
+
+def test_linhas_sem_codigo_nem_nome_sao_descartadas():
+    raw = pd.DataFrame({
+        "CO_MUNICIPIO": ["3200102", None],
+        "NO_MUNICIPIO": ["Afonso Cláudio", None],
+        "Taxa de Aprovação": ["90", "Fonte: INEP"],
+    })
+    censo = prepare_censo(raw, ano=2023)
+    assert censo.index.tolist() == [3200102]
@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+from ideb.export import round_floats, to_csv_bytes
+
+def test_csv_sem_ruido_de_float32_nem_notacao_cientifica():
+    df = pd.DataFrame({
+        "taxa": np.array([79.3, 88.05, np.nan], dtype=np.float32),
+        "matriculas": [12345678.0, 2.0, np.nan],
+        "n": [1, 2, 3],
+    })
+    linhas = to_csv_bytes(df).decode("utf-8").splitlines()
+    assert linhas == ["taxa,matriculas,n", "79.3,12345678.0,1", "88.05,2.0,2", ",,3"]
+
+def test_round_floats_por_coluna():
+    df = pd.DataFrame({"a": np.array([79.3], dtype=np.float32), "b": [0.123456789], "c": ["x"]})
+    out = round_floats(df)
+    assert out["a"].dtype == np.float64 and out["a"].iloc[0] == 79.3
+    assert out["b"].iloc[0] == 0.1234568
+    assert out["c"].iloc[0] == "x"
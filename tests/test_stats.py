@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from ideb.stats import correlation_matrix, pairwise_stats
+
+def _wide(seed: int, n: int = 60, falta: float = 0.25) -> pd.DataFrame:
+    """Matriz município x (família, ano) com empates (valores arredondados) e lacunas diferentes por coluna."""
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(n, 1))
+    valores = (base + rng.normal(scale=0.8, size=(n, 8))).round(1)
+    valores[:, 3] = valores[:, 3].round()  # muitos empates
+    valores[rng.random(valores.shape) < falta] = np.nan
+    valores[:, 0] = np.where(np.isnan(valores[:, 0]), 0.0, valores[:, 0])  # coluna completa
+    cols = pd.MultiIndex.from_product([["VL_A", "VL_B"], [2017, 2019, 2021, 2023]], names=["família", "ano"])
+    return pd.DataFrame(valores, index=[f"M{k}" for k in range(n)], columns=cols)
+
+def test_spearman_igual_ao_pandas_com_lacunas_e_empates():
+    for seed, falta in [(0, 0.1), (1, 0.3), (2, 0.6)]:
+        wide = _wide(seed, falta=falta)
+        esperado = wide.corr(method="spearman", min_periods=2)
+        obtido = correlation_matrix(wide, "spearman")
+        np.testing.assert_allclose(obtido.to_numpy(), esperado.to_numpy(), atol=1e-12, equal_nan=True)
+
+def test_spearman_dos_pares_igual_ao_pandas():
+    wide = _wide(3, falta=0.3)
+    esperado = wide.corr(method="spearman")
+    pares = pairwise_stats(wide, min_n=5)
+    assert len(pares)
+    for linha in pares.itertuples(index=False):
+        x, y = (linha[0], linha[1]), (linha[2], linha[3])
+        assert abs(linha.spearman - esperado.loc[x, y]) < 1e-12